@@ -0,0 +1,21 @@
+"""
+Arbitrum MAGIC/USDC arbitrage bot.
+
+Importing the package has no side effects: no network connection, no .env
+loading and no logging configuration. Use ``python -m bot --help`` for the CLI
+or construct an ``ArbitrageBot`` directly.
+"""
+
+__all__ = ["ArbitrageBot", "BotConfig", "load_config"]
+
+
+def __getattr__(name: str):
+    # Re-exports are resolved lazily so `import bot` stays cheap (web3 is only
+    # imported once something actually needs it).
+    if name == "ArbitrageBot":
+        from .arbitrage_bot_magic_usdc import ArbitrageBot
+        return ArbitrageBot
+    if name in ("BotConfig", "load_config"):
+        from . import config
+        return getattr(config, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
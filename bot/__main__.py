@@ -0,0 +1,8 @@
+import time
+
+# Taken before anything else is imported so --timing can report import cost.
+_START = time.perf_counter()
+
+from .cli import main  # noqa: E402
+
+main(start=_START)
@@ -0,0 +1,218 @@
+import json
+from functools import lru_cache
+
+# ------------------------------------------------------------------------------
+# ABIs for Pricing
+# ------------------------------------------------------------------------------
+UNISWAP_QUOTER_ABI = '''
+[
+  {
+    "name": "quoteExactInputSingle",
+    "type": "function",
+    "inputs": [
+      { "internalType": "address", "name": "tokenIn", "type": "address" },
+      { "internalType": "address", "name": "tokenOut", "type": "address" },
+      { "internalType": "uint24", "name": "fee", "type": "uint24" },
+      { "internalType": "uint256", "name": "amountIn", "type": "uint256" },
+      { "internalType": "uint160", "name": "sqrtPriceLimitX96", "type": "uint160" }
+    ],
+    "outputs": [
+      { "internalType": "uint256", "name": "amountOut", "type": "uint256" }
+    ],
+    "stateMutability": "view"
+  }
+]
+'''
+
+# ------------------------------------------------------------------------------
+# ABIs for other components
+# ------------------------------------------------------------------------------
+TOKEN_ABI = '''[
+    {"constant": true, "inputs": [{"name": "owner", "type": "address"}],
+     "name": "balanceOf", "outputs": [{"name": "", "type": "uint256"}],
+     "payable": false, "stateMutability": "view", "type": "function"},
+    {"constant": true, "inputs": [{"name": "owner", "type": "address"}, {"name": "spender", "type": "address"}],
+     "name": "allowance", "outputs": [{"name": "", "type": "uint256"}],
+     "payable": false, "stateMutability": "view", "type": "function"},
+    {"constant": false, "inputs": [{"name": "spender", "type": "address"},
+     {"name": "amount", "type": "uint256"}],
+     "name": "approve", "outputs": [{"name": "", "type": "bool"}],
+     "payable": false, "stateMutability": "nonpayable", "type": "function"}
+]'''
+
+UNISWAP_ROUTER_ABI = '''[
+  {
+    "inputs": [
+      {
+        "components": [
+          {"internalType": "address", "name": "tokenIn", "type": "address"},
+          {"internalType": "address", "name": "tokenOut", "type": "address"},
+          {"internalType": "uint24", "name": "fee", "type": "uint24"},
+          {"internalType": "address", "name": "recipient", "type": "address"},
+          {"internalType": "uint256", "name": "deadline", "type": "uint256"},
+          {"internalType": "uint256", "name": "amountIn", "type": "uint256"},
+          {"internalType": "uint256", "name": "amountOutMinimum", "type": "uint256"},
+          {"internalType": "uint160", "name": "sqrtPriceLimitX96", "type": "uint160"}
+        ],
+        "internalType": "struct ISwapRouter.ExactInputSingleParams",
+        "name": "params",
+        "type": "tuple"
+      }
+    ],
+    "name": "exactInputSingle",
+    "outputs": [
+      {"internalType": "uint256", "name": "amountOut", "type": "uint256"}
+    ],
+    "stateMutability": "payable",
+    "type": "function"
+  }
+]'''
+
+SUSHISWAP_ROUTER_ABI = '''[
+    {
+      "inputs": [
+         {"internalType": "uint256", "name": "amountIn", "type": "uint256"},
+         {"internalType": "address[]", "name": "path", "type": "address[]"}
+      ],
+      "name": "getAmountsOut",
+      "outputs": [
+         {"internalType": "uint256[]", "name": "amounts", "type": "uint256[]"}
+      ],
+      "stateMutability": "view",
+      "type": "function"
+    },
+    {"inputs":[{"internalType":"address","name":"_factory","type":"address"},
+      {"internalType":"address","name":"_WETH","type":"address"}],
+     "stateMutability":"nonpayable",
+     "type":"constructor"},
+    {"inputs":[],"name":"WETH","outputs":[{"internalType":"address","name":"","type":"address"}],
+     "stateMutability":"view",
+     "type":"function"},
+    {"inputs":[{"internalType":"address","name":"tokenA","type":"address"},
+      {"internalType":"address","name":"tokenB","type":"address"},
+      {"internalType":"uint256","name":"amountADesired","type":"uint256"},
+      {"internalType":"uint256","name":"amountBDesired","type":"uint256"},
+      {"internalType":"uint256","name":"amountAMin","type":"uint256"},
+      {"internalType":"uint256","name":"amountBMin","type":"uint256"},
+      {"internalType":"address","name":"to","type":"address"},
+      {"internalType":"uint256","name":"deadline","type":"uint256"}],
+     "name":"swapExactTokensForTokens",
+     "outputs":[{"internalType":"uint256[]","name":"amounts","type":"uint256[]"}],
+     "stateMutability":"nonpayable",
+     "type":"function"}
+]'''
+
+SUSHISWAP_FACTORY_ABI = '''[
+    {
+        "constant": true,
+        "inputs": [
+            {"internalType": "address", "name": "", "type": "address"},
+            {"internalType": "address", "name": "", "type": "address"}
+        ],
+        "name": "getPair",
+        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
+        "payable": false,
+        "stateMutability": "view",
+        "type": "function"
+    }
+]'''
+
+UNISWAP_V3_FACTORY_ABI = '''[
+    {
+        "inputs": [
+            {"internalType": "address", "name": "tokenA", "type": "address"},
+            {"internalType": "address", "name": "tokenB", "type": "address"},
+            {"internalType": "uint24", "name": "fee", "type": "uint24"}
+        ],
+        "name": "getPool",
+        "outputs": [{"internalType": "address", "name": "pool", "type": "address"}],
+        "stateMutability": "view",
+        "type": "function"
+    }
+]'''
+
+UNISWAP_V3_POOL_ABI = '''[
+    {
+        "inputs": [],
+        "name": "liquidity",
+        "outputs": [{"internalType": "uint128", "name": "", "type": "uint128"}],
+        "stateMutability": "view",
+        "type": "function"
+    }
+]'''
+
+# ------------------------------------------------------------------------------
+# Updated Arbitrage Contract ABI
+# ------------------------------------------------------------------------------
+ARBITRAGE_CONTRACT_ABI = '''[
+    {
+      "inputs": [
+        {"internalType": "address", "name": "_magic", "type": "address"},
+        {"internalType": "address", "name": "_usdc", "type": "address"},
+        {"internalType": "address", "name": "_uniswapRouter", "type": "address"},
+        {"internalType": "address", "name": "_sushiswapRouter", "type": "address"},
+        {"internalType": "uint256", "name": "_minProfit", "type": "uint256"},
+        {"internalType": "uint256", "name": "_minProfitMagic", "type": "uint256"}
+      ],
+      "stateMutability": "nonpayable",
+      "type": "constructor"
+    },
+    {
+      "inputs": [{"internalType": "uint256", "name": "amountIn", "type": "uint256"}],
+      "name": "executeArbitrage",
+      "outputs": [],
+      "stateMutability": "nonpayable",
+      "type": "function"
+    },
+    {
+      "inputs": [{"internalType": "uint256", "name": "amountIn", "type": "uint256"}],
+      "name": "executeArbitrageReverse",
+      "outputs": [],
+      "stateMutability": "nonpayable",
+      "type": "function"
+    },
+    {
+      "inputs": [{"internalType": "uint256", "name": "amountIn", "type": "uint256"}],
+      "name": "executeArbitrageWithMagic",
+      "outputs": [],
+      "stateMutability": "nonpayable",
+      "type": "function"
+    },
+    {
+      "inputs": [{"internalType": "uint256", "name": "amountIn", "type": "uint256"}],
+      "name": "executeArbitrageWithMagicReverse",
+      "outputs": [],
+      "stateMutability": "nonpayable",
+      "type": "function"
+    },
+    {
+      "inputs": [],
+      "name": "withdrawUSDC",
+      "outputs": [],
+      "stateMutability": "nonpayable",
+      "type": "function"
+    },
+    {
+      "inputs": [],
+      "name": "withdrawMAGIC",
+      "outputs": [],
+      "stateMutability": "nonpayable",
+      "type": "function"
+    },
+    {
+      "inputs": [
+         {"internalType": "address", "name": "tokenAddress", "type": "address"},
+         {"internalType": "uint256", "name": "amount", "type": "uint256"}
+      ],
+      "name": "rescueTokens",
+      "outputs": [],
+      "stateMutability": "nonpayable",
+      "type": "function"
+    }
+]'''
+
+
+@lru_cache(maxsize=None)
+def load_abi(name: str) -> list:
+    """Parses one of the ABI strings above on first use and reuses the result."""
+    return json.loads(globals()[name])
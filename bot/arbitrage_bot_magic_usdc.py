@@ -1,762 +1,1054 @@
-import json
-import os
+import logging
 import time
 from datetime import datetime, timedelta
-import logging
-from dotenv import load_dotenv
+from functools import cached_property
+from typing import Callable, Dict, List, Set, Tuple, Optional
+
 from web3 import Web3
-from typing import Tuple, Optional
+from web3.contract import Contract
 
-# ------------------------------------------------------------------------------
-# Logging & Environment Setup
-# ------------------------------------------------------------------------------
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(message)s',
-    handlers=[logging.StreamHandler()]
+from .abis import load_abi
+from .balances import BalanceSnapshot, take_balance_snapshot
+from .block_feed import BlockSubscription
+from .config import (
+    BotConfig, FEE_TIERS, QUOTED_PAIRS, SUSHISWAP_FACTORY, SUSHISWAP_ROUTER, UNISWAP_V3_FACTORY, UNISWAP_V3_QUOTER,
+    UNISWAP_V3_ROUTER, load_config,
 )
+from .log_pipeline import TRADE_LOGGER, DecisionEvent, QuoteEvent, ReceiptEvent, SendEvent, log_event
+from .multicall import multicall
+from .quote_cache import PoolVersionTracker, QuoteCache
+from .scheduler import AdaptiveScheduler, RpcBudget, rpc_budget_middleware
+from .shadow import OpportunityStream
+from .state_store import StateStore
+from .submission import SubmissionBackend, build_submission_backend
+from .token_registry import TokenRegistry
+
 logger = logging.getLogger(__name__)
-load_dotenv()
+trade_logger = logging.getLogger(TRADE_LOGGER)
 
-# ------------------------------------------------------------------------------
-# Configurable Parameters (via environment variables)
-# ------------------------------------------------------------------------------
-SLIPPAGE_TOLERANCE: float = float(os.getenv("SLIPPAGE_TOLERANCE", "0.98"))
-GAS_MULTIPLIER: float = float(os.getenv("GAS_MULTIPLIER", "1.3"))
-TRADE_SIZE_MAGIC: int = int(os.getenv("TRADE_SIZE_MAGIC", "50000000").replace(",", ""))
 
-# ------------------------------------------------------------------------------
-# Environment Variables and Web3 Setup
-# ------------------------------------------------------------------------------
-ARBITRUM_RPC: str = os.getenv("ARBITRUM_RPC")
-PRIVATE_KEY: str = os.getenv("PRIVATE_KEY")
-MY_ADDRESS: str = os.getenv("WALLET_ADDRESS")
-ARBITRAGE_CONTRACT_ADDRESS: str = os.getenv("ARBITRAGE_CONTRACT_ADDRESS")  # Deployed contract
-
-w3: Web3 = Web3(Web3.WebsocketProvider(ARBITRUM_RPC))
-if w3.is_connected():
-    logger.info("✅ Connected to Arbitrum Network")
-else:
-    logger.error("❌ Connection failed!")
-    exit(1)
-
-account = w3.eth.account.from_key(PRIVATE_KEY)
-w3.eth.default_account = account.address
-logger.info(f"✅ Using account: {w3.eth.default_account}")
+ZERO_ADDRESS = "0x" + "0" * 40
 
-# ------------------------------------------------------------------------------
-# Contract and Token Addresses (MAGIC and USDC)
-# ------------------------------------------------------------------------------
-UNISWAP_V3_QUOTER: str = Web3.to_checksum_address("0xb27308f9F90D607463bb33eA1BeBb41C27CE5AB6")
-UNISWAP_V3_ROUTER: str = Web3.to_checksum_address("0xE592427A0AEce92De3Edee1F18E0157C05861564")
-SUSHISWAP_ROUTER: str = Web3.to_checksum_address("0x1b02da8cb0d097eb8d57a175b88c7d8b47997506")
-
-# Set the tokens:
-# - MAGIC: your MAGIC token address (18 decimals)
-# - USDC: common Arbitrum USDC address (6 decimals)
-TOKENS: dict = {
-    "MAGIC": Web3.to_checksum_address("0x539bdE0d7Dbd336b79148AA742883198BBF60342"),
-    "USDC":  Web3.to_checksum_address("0xFF970A61A04b1cA14834A43f5dE4533eBDDB5CC8"),
-    "WETH":  Web3.to_checksum_address("0x82AF49447d8a07e3bd95bd0d56f35241523fbab1")
 
+def pool_key(venue: str, token_a: str, token_b: str, fee: Optional[int] = None) -> str:
+    key = f"{venue}:{'/'.join(sorted((token_a, token_b)))}"
+    return f"{key}:{fee}" if fee is not None else key
+
+
+# Token each route starts (and ends) with, which also sets its trade size.
+ROUTE_START_TOKEN = {"A": "MAGIC", "B": "MAGIC", "C": "USDC", "D": "USDC"}
+ROUTE_DESCRIPTIONS = {
+    "A": "MAGIC→USDC via Uniswap, USDC→MAGIC via SushiSwap",
+    "B": "MAGIC→USDC via SushiSwap, USDC→MAGIC via Uniswap",
+    "C": "USDC→MAGIC via Uniswap, MAGIC→USDC via SushiSwap",
+    "D": "USDC→MAGIC via SushiSwap, MAGIC→USDC via Uniswap",
 }
 
-# Use the MAGIC-USDC pair.
-PAIR: Tuple[str, str] = ("MAGIC", "USDC")
 
 # ------------------------------------------------------------------------------
-# Global Contract Instances for Pricing
+# Arbitrage Engine
 # ------------------------------------------------------------------------------
-SUSHI_ABI = '''
-[
-  {
-    "name": "getAmountsOut",
-    "type": "function",
-    "inputs": [
-      { "type": "uint256", "name": "amountIn" },
-      { "type": "address[]", "name": "path" }
-    ],
-    "outputs": [
-      { "type": "uint256[]", "name": "amounts" }
-    ],
-    "stateMutability": "view"
-  }
-]
-'''
-
-UNISWAP_QUOTER_ABI = '''
-[
-  {
-    "name": "quoteExactInputSingle",
-    "type": "function",
-    "inputs": [
-      { "internalType": "address", "name": "tokenIn", "type": "address" },
-      { "internalType": "address", "name": "tokenOut", "type": "address" },
-      { "internalType": "uint24", "name": "fee", "type": "uint24" },
-      { "internalType": "uint256", "name": "amountIn", "type": "uint256" },
-      { "internalType": "uint160", "name": "sqrtPriceLimitX96", "type": "uint160" }
-    ],
-    "outputs": [
-      { "internalType": "uint256", "name": "amountOut", "type": "uint256" }
-    ],
-    "stateMutability": "view"
-  }
-]
-'''
-
-sushi = w3.eth.contract(address=SUSHISWAP_ROUTER, abi=json.loads(SUSHI_ABI))
-# Use the already defined variable UNISWAP_V3_QUOTER here
-uni_quoter = w3.eth.contract(address=UNISWAP_V3_QUOTER, abi=json.loads(UNISWAP_QUOTER_ABI))
+class ArbitrageBot:
+    """
+    MAGIC/USDC arbitrage engine. Constructing one is free: the web3 connection,
+    account, state store, token registry, submission backend and contract
+    instances are all created on first use.
+    """
 
-# ------------------------------------------------------------------------------
-# ABIs for other components
-# ------------------------------------------------------------------------------
-TOKEN_ABI = '''[
-    {"constant": true, "inputs": [{"name": "owner", "type": "address"}],
-     "name": "balanceOf", "outputs": [{"name": "", "type": "uint256"}],
-     "payable": false, "stateMutability": "view", "type": "function"},
-    {"constant": true, "inputs": [{"name": "owner", "type": "address"}, {"name": "spender", "type": "address"}],
-     "name": "allowance", "outputs": [{"name": "", "type": "uint256"}],
-     "payable": false, "stateMutability": "view", "type": "function"},
-    {"constant": false, "inputs": [{"name": "spender", "type": "address"},
-     {"name": "amount", "type": "uint256"}],
-     "name": "approve", "outputs": [{"name": "", "type": "bool"}],
-     "payable": false, "stateMutability": "nonpayable", "type": "function"}
-]'''
-
-UNISWAP_ROUTER_ABI = '''[
-  {
-    "inputs": [
-      {
-        "components": [
-          {"internalType": "address", "name": "tokenIn", "type": "address"},
-          {"internalType": "address", "name": "tokenOut", "type": "address"},
-          {"internalType": "uint24", "name": "fee", "type": "uint24"},
-          {"internalType": "address", "name": "recipient", "type": "address"},
-          {"internalType": "uint256", "name": "deadline", "type": "uint256"},
-          {"internalType": "uint256", "name": "amountIn", "type": "uint256"},
-          {"internalType": "uint256", "name": "amountOutMinimum", "type": "uint256"},
-          {"internalType": "uint160", "name": "sqrtPriceLimitX96", "type": "uint160"}
-        ],
-        "internalType": "struct ISwapRouter.ExactInputSingleParams",
-        "name": "params",
-        "type": "tuple"
-      }
-    ],
-    "name": "exactInputSingle",
-    "outputs": [
-      {"internalType": "uint256", "name": "amountOut", "type": "uint256"}
-    ],
-    "stateMutability": "payable",
-    "type": "function"
-  }
-]'''
-
-SUSHISWAP_ROUTER_ABI = '''[
-    {
-      "inputs": [
-         {"internalType": "uint256", "name": "amountIn", "type": "uint256"},
-         {"internalType": "address[]", "name": "path", "type": "address[]"}
-      ],
-      "name": "getAmountsOut",
-      "outputs": [
-         {"internalType": "uint256[]", "name": "amounts", "type": "uint256[]"}
-      ],
-      "stateMutability": "view",
-      "type": "function"
-    },
-    {"inputs":[{"internalType":"address","name":"_factory","type":"address"},
-      {"internalType":"address","name":"_WETH","type":"address"}],
-     "stateMutability":"nonpayable",
-     "type":"constructor"},
-    {"inputs":[],"name":"WETH","outputs":[{"internalType":"address","name":"","type":"address"}],
-     "stateMutability":"view",
-     "type":"function"},
-    {"inputs":[{"internalType":"address","name":"tokenA","type":"address"},
-      {"internalType":"address","name":"tokenB","type":"address"},
-      {"internalType":"uint256","name":"amountADesired","type":"uint256"},
-      {"internalType":"uint256","name":"amountBDesired","type":"uint256"},
-      {"internalType":"uint256","name":"amountAMin","type":"uint256"},
-      {"internalType":"uint256","name":"amountBMin","type":"uint256"},
-      {"internalType":"address","name":"to","type":"address"},
-      {"internalType":"uint256","name":"deadline","type":"uint256"}],
-     "name":"swapExactTokensForTokens",
-     "outputs":[{"internalType":"uint256[]","name":"amounts","type":"uint256[]"}],
-     "stateMutability":"nonpayable",
-     "type":"function"}
-]'''
+    def __init__(self, config: Optional[BotConfig] = None) -> None:
+        self.config = config or load_config()
+        self.tokens = self.config.tokens
+        self._contracts: dict = {}
+        # Next nonce to use. Synced from the chain's pending count, then tracked locally
+        # so repeated get_nonce() calls within a transaction don't each hit the node.
+        self._next_nonce: Optional[int] = None
+        # Pool snapshots: the latest quotes seen per pool, persisted once per cycle.
+        self.cycle_quotes: dict = {}
+        # Uniswap V3 fee tiers worth quoting per pair, re-discovered every fee_tier_refresh_interval.
+        self._fee_tiers: Dict[str, List[int]] = {}
+        self._fee_tiers_refreshed_at = 0.0
+        # Sent arbitrage transactions awaiting a receipt: tx hash -> (route, block it was sent at, nonce).
+        self._pending_txs: Dict[str, Tuple[str, Optional[int], int]] = {}
+        # Latest balances/allowances of the wallet and the executor contract, refreshed once per block.
+        self.balances: Optional[BalanceSnapshot] = None
 
-# ------------------------------------------------------------------------------
-# Updated Arbitrage Contract ABI
-# ------------------------------------------------------------------------------
-ARBITRAGE_CONTRACT_ABI = '''[
-    {
-      "inputs": [
-        {"internalType": "address", "name": "_magic", "type": "address"},
-        {"internalType": "address", "name": "_usdc", "type": "address"},
-        {"internalType": "address", "name": "_uniswapRouter", "type": "address"},
-        {"internalType": "address", "name": "_sushiswapRouter", "type": "address"},
-        {"internalType": "uint256", "name": "_minProfit", "type": "uint256"},
-        {"internalType": "uint256", "name": "_minProfitMagic", "type": "uint256"}
-      ],
-      "stateMutability": "nonpayable",
-      "type": "constructor"
-    },
-    {
-      "inputs": [{"internalType": "uint256", "name": "amountIn", "type": "uint256"}],
-      "name": "executeArbitrage",
-      "outputs": [],
-      "stateMutability": "nonpayable",
-      "type": "function"
-    },
-    {
-      "inputs": [{"internalType": "uint256", "name": "amountIn", "type": "uint256"}],
-      "name": "executeArbitrageReverse",
-      "outputs": [],
-      "stateMutability": "nonpayable",
-      "type": "function"
-    },
-    {
-      "inputs": [{"internalType": "uint256", "name": "amountIn", "type": "uint256"}],
-      "name": "executeArbitrageWithMagic",
-      "outputs": [],
-      "stateMutability": "nonpayable",
-      "type": "function"
-    },
-    {
-      "inputs": [{"internalType": "uint256", "name": "amountIn", "type": "uint256"}],
-      "name": "executeArbitrageWithMagicReverse",
-      "outputs": [],
-      "stateMutability": "nonpayable",
-      "type": "function"
-    },
-    {
-      "inputs": [],
-      "name": "withdrawUSDC",
-      "outputs": [],
-      "stateMutability": "nonpayable",
-      "type": "function"
-    },
-    {
-      "inputs": [],
-      "name": "withdrawMAGIC",
-      "outputs": [],
-      "stateMutability": "nonpayable",
-      "type": "function"
-    },
-    {
-      "inputs": [
-         {"internalType": "address", "name": "tokenAddress", "type": "address"},
-         {"internalType": "uint256", "name": "amount", "type": "uint256"}
-      ],
-      "name": "rescueTokens",
-      "outputs": [],
-      "stateMutability": "nonpayable",
-      "type": "function"
-    }
-]'''
+    # --------------------------------------------------------------------------
+    # Lazily created resources
+    # --------------------------------------------------------------------------
+    @cached_property
+    def w3(self) -> Web3:
+        rpc = self.config.arbitrum_rpc
+        if not rpc:
+            raise ConnectionError("ARBITRUM_RPC is not set")
+        provider = Web3.WebsocketProvider(rpc) if rpc.startswith("ws") else Web3.HTTPProvider(rpc)
+        w3 = Web3(provider)
+        # Every request is debited from the RPC budget the scheduler plans against.
+        w3.middleware_onion.add(rpc_budget_middleware(self.rpc_budget), "rpc_budget")
+        if not w3.is_connected():
+            logger.error("❌ Connection failed!")
+            raise ConnectionError(f"Could not connect to {rpc}")
+        logger.info("✅ Connected to Arbitrum Network")
+        if self.config.private_key:
+            w3.eth.default_account = w3.eth.account.from_key(self.config.private_key).address
+            logger.info(f"✅ Using account: {w3.eth.default_account}")
+        return w3
 
-# ------------------------------------------------------------------------------
-# Helper Functions
-# ------------------------------------------------------------------------------
-def get_decimals(token_symbol: str) -> int:
-    if token_symbol == "MAGIC":
-        return 18
-    if token_symbol == "USDC":
-        return 6
-    return 18
-
-def get_trade_size(token_symbol: str) -> int:
-    # For USDC-based trades, use 10 USDC (10_000_000 raw units).
-    if token_symbol == "MAGIC":
-        return TRADE_SIZE_MAGIC
-    return 10_000_000
-
-def get_token_balance(token_symbol: str) -> float:
-    token_contract = w3.eth.contract(address=TOKENS[token_symbol], abi=json.loads(TOKEN_ABI))
-    balance = token_contract.functions.balanceOf(w3.eth.default_account).call()
-    return balance / (10 ** get_decimals(token_symbol))
-
-def get_raw_balance(token_symbol: str) -> int:
-    token_contract = w3.eth.contract(address=TOKENS[token_symbol], abi=json.loads(TOKEN_ABI))
-    return token_contract.functions.balanceOf(w3.eth.default_account).call()
-
-def check_balances() -> Tuple[float, float]:
-    try:
-        magic_contract = w3.eth.contract(address=TOKENS["MAGIC"], abi=json.loads(TOKEN_ABI))
-        usdc_contract = w3.eth.contract(address=TOKENS["USDC"], abi=json.loads(TOKEN_ABI))
-        magic_balance = magic_contract.functions.balanceOf(w3.eth.default_account).call()
-        usdc_balance = usdc_contract.functions.balanceOf(w3.eth.default_account).call()
-        magic_corrected = magic_balance / (10 ** get_decimals("MAGIC"))
-        usdc_corrected = usdc_balance / (10 ** get_decimals("USDC"))
-        logger.info(f"💰 Wallet MAGIC Balance: {magic_corrected} MAGIC")
-        logger.info(f"💰 Wallet USDC Balance: {usdc_corrected} USDC")
-        return magic_corrected, usdc_corrected
-    except Exception as e:
-        logger.error(f"Error checking wallet balances: {e}")
-        return 0, 0
-
-def get_nonce() -> int:
-    time.sleep(0.5)
-    return w3.eth.get_transaction_count(w3.eth.default_account, "pending")
-
-def check_allowance(token_symbol: str, spender: str) -> int:
-    token_contract = w3.eth.contract(address=TOKENS[token_symbol], abi=json.loads(TOKEN_ABI))
-    return token_contract.functions.allowance(w3.eth.default_account, spender).call()
-
-def approve_tokens_if_needed(token_symbol: str, spender: str, required_amount: int) -> None:
-    current_allowance = check_allowance(token_symbol, spender)
-    if current_allowance >= required_amount:
-        logger.info(f"✅ Allowance for {token_symbol} on {spender} sufficient: {current_allowance}")
-        return
-    try:
-        token_contract = w3.eth.contract(address=TOKENS[token_symbol], abi=json.loads(TOKEN_ABI))
-        nonce = get_nonce()
-        txn = token_contract.functions.approve(spender, required_amount).build_transaction({
-            'from': w3.eth.default_account,
-            'gas': 60000,
-            'gasPrice': int(w3.eth.gas_price * GAS_MULTIPLIER),
-            'nonce': nonce,
-        })
-        signed_txn = w3.eth.account.sign_transaction(txn, PRIVATE_KEY)
-        tx_hash = w3.eth.send_raw_transaction(signed_txn.rawTransaction)
-        logger.info(f"✅ Approved {token_symbol} spending on {spender}! TX Hash: {tx_hash.hex()}")
-    except Exception as e:
-        logger.error(f"Error approving tokens for {spender}: {e}")
-
-def swap_on_uniswap_pair(token_in: str, token_out: str, amount_in_wei: int) -> Optional[str]:
-    try:
-        token_contract = w3.eth.contract(address=TOKENS[token_in], abi=json.loads(TOKEN_ABI))
-        balance = token_contract.functions.balanceOf(w3.eth.default_account).call()
-        if balance < amount_in_wei:
-            logger.error(f"❌ Insufficient {token_in} balance for Uniswap swap.")
-            return None
-        router_contract = w3.eth.contract(address=UNISWAP_V3_ROUTER, abi=json.loads(UNISWAP_ROUTER_ABI))
-        expected_uniswap_price, best_fee = get_uniswap_v3_price(amount_in_wei, token_in, token_out)
-        if expected_uniswap_price is None or best_fee is None:
-            logger.error(f"❌ Could not retrieve Uniswap price for {token_in} -> {token_out} swap with input {amount_in_wei}")
-            return None
-        decimals = get_decimals(token_out)
-        expected_out = int(expected_uniswap_price * (10 ** decimals))
-        amount_out_min = int(expected_out * SLIPPAGE_TOLERANCE)
-        logger.info(f"Uniswap {token_in}->{token_out} swap: best fee tier = {best_fee}, expected_out = {expected_out}, amountOutMinimum = {amount_out_min}")
-        base_fee = w3.eth.gas_price
-        max_priority_fee = w3.to_wei(2, 'gwei')
-        max_fee = base_fee + max_priority_fee
-        txn = router_contract.functions.exactInputSingle({
-            "tokenIn": TOKENS[token_in],
-            "tokenOut": TOKENS[token_out],
-            "fee": best_fee,
-            "recipient": MY_ADDRESS,
-            "deadline": int(time.time()) + 300,
-            "amountIn": amount_in_wei,
-            "amountOutMinimum": amount_out_min,
-            "sqrtPriceLimitX96": 0
-        }).build_transaction({
-            "from": MY_ADDRESS,
-            "gas": 80000,
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-            "nonce": get_nonce()
-        })
-        return sign_and_send_transaction(txn)
-    except Exception as e:
-        logger.error(f"Error in swap_on_uniswap_pair ({token_in} -> {token_out}, input: {amount_in_wei}): {e}")
-        return None
-
-def swap_on_sushiswap_pair(token_in: str, token_out: str, amount_in_wei: int) -> Optional[str]:
-    try:
-        router_contract = w3.eth.contract(address=SUSHISWAP_ROUTER, abi=json.loads(SUSHISWAP_ROUTER_ABI))
-        base_fee = w3.eth.gas_price
-        max_priority_fee = w3.to_wei(2, 'gwei')
-        max_fee = base_fee + max_priority_fee
-        txn = router_contract.functions.swapExactTokensForTokens(
-            amount_in_wei,
-            0,
-            [TOKENS[token_in], TOKENS[token_out]],
-            MY_ADDRESS,
-            int(time.time()) + 300
-        ).build_transaction({
-            "from": MY_ADDRESS,
-            "gas": 80000,
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-            "nonce": get_nonce()
-        })
-        signed_txn = w3.eth.account.sign_transaction(txn, PRIVATE_KEY)
-        tx_hash = w3.eth.send_raw_transaction(signed_txn.rawTransaction)
-        logger.info(f"✅ Transaction Sent! TX Hash: {tx_hash.hex()}")
-        return tx_hash.hex()
-    except Exception as e:
-        logger.error(f"Error in swap_on_sushiswap_pair ({token_in} -> {token_out}, input: {amount_in_wei}): {e}")
-        return None
-
-def sign_and_send_transaction(txn: dict) -> Optional[str]:
-    try:
-        base_fee = w3.eth.gas_price
-        max_priority_fee_per_gas = w3.to_wei(1, 'gwei')
-        max_fee_per_gas = base_fee + max_priority_fee_per_gas
-        txn.update({
-            'maxPriorityFeePerGas': max_priority_fee_per_gas,
-            'maxFeePerGas': max_fee_per_gas,
-            'nonce': get_nonce(),
-            'gas': w3.eth.estimate_gas(txn)
-        })
-        signed_txn = w3.eth.account.sign_transaction(txn, PRIVATE_KEY)
-        tx_hash = w3.eth.send_raw_transaction(signed_txn.rawTransaction)
-        logger.info(f"✅ Transaction Sent! TX Hash: {tx_hash.hex()}")
-        return tx_hash.hex()
-    except Exception as e:
-        logger.error(f"Error sending transaction: {e}")
-        return None
-
-def get_uniswap_v3_price(amount_in_wei: int, token_in: str, token_out: str) -> Tuple[Optional[float], Optional[int]]:
-    try:
-        fee_tiers = [100, 500, 3000, 10000]
-        best_amount_out = 0
-        best_fee: Optional[int] = None
-        decimals_out = get_decimals(token_out)
-        for fee in fee_tiers:
+    @cached_property
+    def rpc_budget(self) -> RpcBudget:
+        return RpcBudget(self.config.rpc_budget_per_second, self.config.rpc_budget_burst)
+
+    @cached_property
+    def scheduler(self) -> AdaptiveScheduler:
+        scheduler = AdaptiveScheduler(
+            self.rpc_budget, self.config.scheduler_max_interval_blocks, self.config.escalate_margin_usdc,
+            self.config.min_profit_threshold_usdt, report_interval=self.config.budget_report_interval
+        )
+        # All four routes share the MAGIC/USDC pools and are evaluated together, so they are
+        # scheduled as one target. Pools found later by refresh_fee_tiers() are added to it.
+        scheduler.add_target("MAGIC/USDC", self.scheduled_pools())
+        return scheduler
+
+    def scheduled_pools(self) -> List[str]:
+        """Known MAGIC/USDC pool addresses: a state change in any of them makes the scheduler re-evaluate."""
+        pair = pool_key("", "MAGIC", "USDC")
+        return [
+            address for name, address in self.pool_addresses.items()
+            if name.startswith(("sushiswap" + pair, "uniswap_v3" + pair)) and address != ZERO_ADDRESS
+        ]
+
+    @cached_property
+    def store(self) -> StateStore:
+        return StateStore(self.config.state_db_path)
+
+    @cached_property
+    def registry(self) -> TokenRegistry:
+        # Decimals/symbols for every token: read from the state store, or fetched
+        # in one batched call on first start.
+        registry = TokenRegistry(self.w3, self.store)
+        registry.load(self.tokens)
+        return registry
+
+    @cached_property
+    def pool_addresses(self) -> Dict[str, str]:
+        # SushiSwap pair and Uniswap V3 pool (per fee tier) of every quoted pair, keyed by
+        # pool_key(). Read from the state store; missing ones resolved in one batched call.
+        wanted = []
+        for token_a, token_b in QUOTED_PAIRS:
+            wanted.append(("sushiswap", token_a, token_b, None))
+            wanted.extend(("uniswap_v3", token_a, token_b, fee) for fee in FEE_TIERS)
+        pools = self.store.get_pools()
+        missing = [w for w in wanted if pool_key(*w) not in pools]
+        if missing:
+            sushi_factory = self.contract(SUSHISWAP_FACTORY, "SUSHISWAP_FACTORY_ABI")
+            uni_factory = self.contract(UNISWAP_V3_FACTORY, "UNISWAP_V3_FACTORY_ABI")
+            calls = [
+                sushi_factory.functions.getPair(self.tokens[a], self.tokens[b]) if fee is None
+                else uni_factory.functions.getPool(self.tokens[a], self.tokens[b], fee)
+                for _, a, b, fee in missing
+            ]
             try:
-                amount_out = uni_quoter.functions.quoteExactInputSingle(
-                    TOKENS[token_in],
-                    TOKENS[token_out],
-                    fee,
-                    amount_in_wei,
-                    0
-                ).call()
-                human_readable = amount_out / (10 ** decimals_out)
-                logger.info(f"Fee tier {fee}: Received amount_out = {amount_out} ({human_readable:.6f}) for input {amount_in_wei} of {token_in} -> {token_out}")
-                if amount_out > best_amount_out:
-                    best_amount_out = amount_out
-                    best_fee = fee
+                results = multicall(self.w3, calls)
             except Exception as e:
-                logger.error(f"Error quoting fee tier {fee} for {token_in} -> {token_out} with input {amount_in_wei}: {e}")
+                logger.error(f"Error discovering pool addresses: {e}")
+                results = [None] * len(missing)
+            for pool, address in zip(missing, results):
+                if address is not None:
+                    pools[pool_key(*pool)] = Web3.to_checksum_address(address)
+                    self.store.set_pool(pool_key(*pool), pools[pool_key(*pool)])
+        return pools
+
+    def pool_address(self, venue: str, token_a: str, token_b: str, fee: Optional[int] = None) -> Optional[str]:
+        """Address of the pool, or None if it doesn't exist or couldn't be resolved."""
+        address = self.pool_addresses.get(pool_key(venue, token_a, token_b, fee))
+        return address if address and address != ZERO_ADDRESS else None
+
+    def refresh_fee_tiers(self) -> None:
+        """
+        Finds the Uniswap V3 fee tiers worth quoting for every pair: the pool must
+        exist and hold at least fee_tier_min_liquidity_share of the in-range
+        liquidity of the pair's deepest tier. Pools created since the last
+        refresh are picked up here.
+        """
+        self._fee_tiers_refreshed_at = time.time()
+        pools = self.pool_addresses
+        tiers = [(a, b, fee) for a, b in QUOTED_PAIRS for fee in FEE_TIERS]
+        try:
+            missing = [t for t in tiers if self.pool_address("uniswap_v3", *t) is None]
+            if missing:
+                uni_factory = self.contract(UNISWAP_V3_FACTORY, "UNISWAP_V3_FACTORY_ABI")
+                results = multicall(self.w3, [
+                    uni_factory.functions.getPool(self.tokens[a], self.tokens[b], fee) for a, b, fee in missing
+                ])
+                for (a, b, fee), address in zip(missing, results):
+                    if address is None or address == ZERO_ADDRESS:
+                        continue
+                    name = pool_key("uniswap_v3", a, b, fee)
+                    pools[name] = Web3.to_checksum_address(address)
+                    self.store.set_pool(name, pools[name])
+                    self.pool_versions.watch(pools[name])
+                    logger.info(f"New Uniswap V3 pool {name}: {pools[name]}")
+                if "scheduler" in self.__dict__:
+                    self.scheduler.targets["MAGIC/USDC"].pools.update(self.scheduled_pools())
+
+            existing = [t for t in tiers if self.pool_address("uniswap_v3", *t) is not None]
+            liquidity = multicall(self.w3, [
+                self.contract(self.pool_address("uniswap_v3", *t), "UNISWAP_V3_POOL_ABI").functions.liquidity()
+                for t in existing
+            ])
+        except Exception as e:
+            logger.warning(f"Fee tier discovery failed, quoting every known tier: {e}")
+            return
+
+        # A failed liquidity() sub-call comes back as None: that tier is unknown, not dead.
+        depth = dict(zip(existing, liquidity))
+        min_share = self.config.fee_tier_min_liquidity_share
+        for token_a, token_b in QUOTED_PAIRS:
+            pair_depth = {fee: depth[(token_a, token_b, fee)] for fee in FEE_TIERS if (token_a, token_b, fee) in depth}
+            known = {fee: liq for fee, liq in pair_depth.items() if liq is not None}
+            if not known:
+                logger.warning("No liquidity data for Uniswap V3 %s/%s, quoting every tier", token_a, token_b)
+                self._fee_tiers[pool_key("uniswap_v3", token_a, token_b)] = list(FEE_TIERS)
                 continue
-        if best_amount_out:
-            computed_price = best_amount_out / (10 ** decimals_out)
-            logger.info(f"Best fee tier: {best_fee}, computed price: {computed_price:.6f} for {token_in} -> {token_out}")
-            return computed_price, best_fee
-        else:
-            logger.error("No valid price retrieved for any fee tier.")
-            return None, None
-    except Exception as e:
-        logger.error(f"Error in get_uniswap_v3_price ({token_in}->{token_out}, input: {amount_in_wei}): {e}")
-        return None, None
-
-def get_sushiswap_price(amount_in_wei: int, token_in: str, token_out: str) -> Optional[float]:
-    try:
-        router_contract = w3.eth.contract(address=SUSHISWAP_ROUTER, abi=json.loads(SUSHISWAP_ROUTER_ABI))
-        amounts_out = router_contract.functions.getAmountsOut(
-            amount_in_wei, [TOKENS[token_in], TOKENS[token_out]]
-        ).call()
-        decimals_out = get_decimals(token_out)
-        return amounts_out[-1] / (10 ** decimals_out)
-    except Exception as e:
-        logger.error(f"Error in get_sushiswap_price ({token_in} -> {token_out}, input: {amount_in_wei}): {e}")
-        return None
-
-def estimate_total_gas_fee() -> float:
-    try:
-        total_gas = 80000
-        current_gas_price = w3.eth.gas_price
-        fee_in_wei = total_gas * current_gas_price
-        fee_in_eth = float(w3.from_wei(fee_in_wei, 'ether'))
-        return fee_in_eth
-    except Exception as e:
-        logger.error(f"Error estimating gas fee: {e}")
-        return 0
+            deepest = max(known.values())
+            active = [fee for fee, liq in pair_depth.items() if liq is None or (liq and liq >= deepest * min_share)]
+            pruned = [fee for fee in FEE_TIERS if fee not in active]
+            self._fee_tiers[pool_key("uniswap_v3", token_a, token_b)] = active
+            logger.info(f"Uniswap V3 {token_a}/{token_b} fee tiers: quoting {active}, pruned {pruned}")
 
-# ------------------------------------------------------------------------------
-# Arbitrage Simulation and Execution with Four Routes
-# ------------------------------------------------------------------------------
-MIN_PROFIT_THRESHOLD_USDT: float = 0.01  
-MAX_TRADES_PER_DAY: int = 10
-trade_count: int = 0
-next_reset: datetime = datetime.now() + timedelta(days=1)
+    def active_fee_tiers(self, token_a: str, token_b: str) -> List[int]:
+        if time.time() - self._fee_tiers_refreshed_at >= self.config.fee_tier_refresh_interval:
+            self.refresh_fee_tiers()
+        return self._fee_tiers.get(pool_key("uniswap_v3", token_a, token_b), FEE_TIERS)
 
-def get_weth_to_usdc_rate() -> float:
-    """
-    Returns the conversion rate for 1 WETH to USDC (in human-readable USDC value).
-    """
-    amount_in = 10**18  # 1 WETH in wei
-    try:
-        quote, _ = get_uniswap_v3_price(amount_in, "WETH", "USDC")
-        return quote if quote is not None else 0
-    except Exception as e:
-        logger.error(f"Error getting WETH->USDC rate: {e}")
-        return 0
-
-def simulate_round_trip_arbitrage() -> dict:
-    results = {}
-    # ----- Routes starting with MAGIC (trade size for MAGIC) -----
-    magic_trade = get_trade_size("MAGIC")
-    initial_magic = magic_trade / (10 ** get_decimals("MAGIC"))
-    
-    # Route A: MAGIC→USDC via Uniswap, then USDC→MAGIC via SushiSwap.
-    uni_usdc = get_uniswap_v3_price(magic_trade, "MAGIC", "USDC")
-    if uni_usdc[0] is None:
-        route_A_profit = None
-    else:
-        uni_usdc_amount = uni_usdc[0]
-        usdc_amount_wei_A = int(uni_usdc_amount * (10 ** get_decimals("USDC")))
-        sushi_magic_received = get_sushiswap_price(usdc_amount_wei_A, "USDC", "MAGIC")
-        route_A_profit = (sushi_magic_received - initial_magic) if sushi_magic_received is not None else None
-
-    # Route B: MAGIC→USDC via SushiSwap, then USDC→MAGIC via Uniswap.
-    sushi_usdc = get_sushiswap_price(magic_trade, "MAGIC", "USDC")
-    if sushi_usdc is None:
-        route_B_profit = None
-    else:
-        usdc_amount_wei_B = int(sushi_usdc * (10 ** get_decimals("USDC")))
-        uni_magic = get_uniswap_v3_price(usdc_amount_wei_B, "USDC", "MAGIC")
-        route_B_profit = (uni_magic[0] - initial_magic) if uni_magic[0] is not None else None
-
-    # ----- Routes starting with USDC (trade size for USDC) -----
-    usdc_trade = get_trade_size("USDC")
-    initial_usdc = usdc_trade / (10 ** get_decimals("USDC"))
-    
-    # Route C: USDC→MAGIC via Uniswap, then MAGIC→USDC via SushiSwap.
-    uni_magic_for_usdc = get_uniswap_v3_price(usdc_trade, "USDC", "MAGIC")
-    if uni_magic_for_usdc[0] is None:
-        route_C_profit = None
-    else:
-        uni_magic_amount = uni_magic_for_usdc[0]
-        magic_amount_wei = int(uni_magic_amount * (10 ** get_decimals("MAGIC")))
-        sushi_usdc_received = get_sushiswap_price(magic_amount_wei, "MAGIC", "USDC")
-        route_C_profit = (sushi_usdc_received - initial_usdc) if sushi_usdc_received is not None else None
-
-    # Route D: USDC→MAGIC via SushiSwap, then MAGIC→USDC via Uniswap.
-    sushi_magic_for_usdc = get_sushiswap_price(usdc_trade, "USDC", "MAGIC")
-    if sushi_magic_for_usdc is None:
-        route_D_profit = None
-    else:
-        magic_amount_wei = int(sushi_magic_for_usdc * (10 ** get_decimals("MAGIC")))
-        uni_usdc_for_usdc = get_uniswap_v3_price(magic_amount_wei, "MAGIC", "USDC")
-        route_D_profit = (uni_usdc_for_usdc[0] - initial_usdc) if uni_usdc_for_usdc[0] is not None else None
-
-    # For routes A and B, convert profit (in MAGIC) to USDC.
-    magic_to_usdc_rate, _ = get_uniswap_v3_price(10**18, "MAGIC", "USDC")
-    if magic_to_usdc_rate is None:
-        magic_to_usdc_rate = 1
-    route_A_profit_usdc = route_A_profit * magic_to_usdc_rate if route_A_profit is not None else None
-    route_B_profit_usdc = route_B_profit * magic_to_usdc_rate if route_B_profit is not None else None
-
-    # Routes C and D are already in USDC terms.
-    net_profit_A = route_A_profit_usdc
-    net_profit_B = route_B_profit_usdc
-    net_profit_C = route_C_profit
-    net_profit_D = route_D_profit
-
-    # Estimate gas fee in ETH and convert to USDC.
-    gas_fee_eth = estimate_total_gas_fee()
-    weth_to_usdc_rate = get_weth_to_usdc_rate()
-    gas_fee_usdc = gas_fee_eth * weth_to_usdc_rate
-
-    net_profit_A = net_profit_A - gas_fee_usdc if net_profit_A is not None else None
-    net_profit_B = net_profit_B - gas_fee_usdc if net_profit_B is not None else None
-    net_profit_C = net_profit_C - gas_fee_usdc if net_profit_C is not None else None
-    net_profit_D = net_profit_D - gas_fee_usdc if net_profit_D is not None else None
-
-    if net_profit_A is not None:
-        logger.info(f"Route A (MAGIC→USDC via Uniswap, USDC→MAGIC via SushiSwap): Net profit = {net_profit_A:.2f} USDC")
-    else:
-        logger.info("Route A simulation failed.")
-
-    if net_profit_B is not None:
-        logger.info(f"Route B (MAGIC→USDC via SushiSwap, USDC→MAGIC via Uniswap): Net profit = {net_profit_B:.2f} USDC")
-    else:
-        logger.info("Route B simulation failed.")
-
-    if net_profit_C is not None:
-        logger.info(f"Route C (USDC→MAGIC via Uniswap, MAGIC→USDC via SushiSwap): Net profit = {net_profit_C:.2f} USDC")
-    else:
-        logger.info("Route C simulation failed.")
-
-    if net_profit_D is not None:
-        logger.info(f"Route D (USDC→MAGIC via SushiSwap, MAGIC→USDC via Uniswap): Net profit = {net_profit_D:.2f} USDC")
-    else:
-        logger.info("Route D simulation failed.")
-
-    results["A"] = net_profit_A
-    results["B"] = net_profit_B
-    results["C"] = net_profit_C
-    results["D"] = net_profit_D
-    return results
-
-def reset_trade_counter_if_needed() -> None:
-    global trade_count, next_reset
-    if datetime.now() >= next_reset:
-        trade_count = 0
-        next_reset = datetime.now() + timedelta(days=1)
-        logger.info("Trade counter reset for new day.")
+    @cached_property
+    def quote_cache(self) -> QuoteCache:
+        return QuoteCache(self.config.quote_cache_size, self.config.quote_cache_bucket_bps)
 
-# ------------------------------------------------------------------------------
-# New helper: Get contract USDC balance.
-# ------------------------------------------------------------------------------
-def get_contract_usdc_balance() -> float:
-    try:
-        usdc_contract = w3.eth.contract(address=TOKENS["USDC"], abi=json.loads(TOKEN_ABI))
-        balance = usdc_contract.functions.balanceOf(ARBITRAGE_CONTRACT_ADDRESS).call()
-        contract_balance = balance / (10 ** get_decimals("USDC"))
-        logger.info(f"💰 Contract USDC Balance: {contract_balance} USDC")
-        return contract_balance
-    except Exception as e:
-        logger.error(f"Error checking contract USDC balance: {e}")
-        return 0
+    @cached_property
+    def pool_versions(self) -> PoolVersionTracker:
+        # Snapshots saved with a pool version seed the quote cache, so after a restart
+        # quotes for pools that haven't changed since are served without an RPC call.
+        tracker = PoolVersionTracker(self.w3)
+        snapshots = self.store.load_snapshots()
+        # Only snapshots from the last saved cycle are used: every pool still quoted was saved at
+        # that block, while a pool that stopped being quoted (e.g. a pruned fee tier) keeps an
+        # old snapshot, which would pull the first log range back past MAX_LOG_RANGE.
+        newest = max((snapshot["block"] for snapshot in snapshots.values()), default=None)
+        for name, address in self.pool_addresses.items():
+            if address == ZERO_ADDRESS:
+                continue
+            snapshot = snapshots.get(name)
+            state = snapshot["state"] if snapshot and snapshot["block"] == newest else {}
+            version = state.get("version")
+            tracker.watch(address, version)
+            if version is None:
+                continue
+            quotes = []
+            for key, amount_out in state.get("quotes", {}).items():
+                direction, amount_in = key.rsplit(":", 1)
+                token_in, token_out = direction.split(">")
+                quotes.append((token_in, token_out, int(amount_in), amount_out))
+            self.quote_cache.seed(address, version, quotes)
+            tracker.last_block = newest
+        return tracker
 
-# ------------------------------------------------------------------------------
-# New helper: Get contract MAGIC balance.
-# ------------------------------------------------------------------------------
-def get_contract_magic_balance() -> float:
-    try:
-        magic_contract = w3.eth.contract(address=TOKENS["MAGIC"], abi=json.loads(TOKEN_ABI))
-        balance = magic_contract.functions.balanceOf(ARBITRAGE_CONTRACT_ADDRESS).call()
-        contract_balance = balance / (10 ** get_decimals("MAGIC"))
-        logger.info(f"💰 Contract MAGIC Balance: {contract_balance} MAGIC")
-        return contract_balance
-    except Exception as e:
-        logger.error(f"Error checking contract MAGIC balance: {e}")
-        return 0
+    @cached_property
+    def submitter(self) -> SubmissionBackend:
+        submitter = build_submission_backend(
+            self.config.submission_mode, self.w3, self.config.private_relay_urls,
+            self.config.bundle_target_blocks, self.config.relay_timeout, self.config.relay_max_retries
+        )
+        logger.info(f"✅ Submission mode: {submitter.name}")
+        return submitter
 
-# ------------------------------------------------------------------------------
-# Modified Trade Execution: Call the Smart Contract Directly
-# ------------------------------------------------------------------------------
-def execute_arbitrage_trade(direction: str) -> Optional[str]:
-    nonce = get_nonce()
-    contract_instance = w3.eth.contract(address=ARBITRAGE_CONTRACT_ADDRESS, abi=json.loads(ARBITRAGE_CONTRACT_ABI))
-    
-    # Mapping based on direction:
-    # Route A: MAGIC-based → executeArbitrageWithMagic
-    # Route B: MAGIC-based reverse → executeArbitrageWithMagicReverse
-    # Route C: USDC-based → executeArbitrageReverse
-    # Route D: USDC-based → executeArbitrage
-    if direction in ["A", "B"]:
-        trade_size = get_trade_size("MAGIC")
-        if trade_size == 0:
-            logger.error("Trade size is 0 for MAGIC-based trade.")
-            return None
-        if direction == "A":
-            logger.info("Executing Route A via smart contract: MAGIC → USDC on Uniswap V3 then USDC → MAGIC on SushiSwap.")
-            txn = contract_instance.functions.executeArbitrageWithMagic(trade_size).build_transaction({
-                'from': MY_ADDRESS,
-                'gas': 80000,
-                'gasPrice': int(w3.eth.gas_price * GAS_MULTIPLIER),
+    def contract(self, address: str, abi_name: str) -> Contract:
+        key = (address, abi_name)
+        if key not in self._contracts:
+            self._contracts[key] = self.w3.eth.contract(address=address, abi=load_abi(abi_name))
+        return self._contracts[key]
+
+    def token_contract(self, token_symbol: str) -> Contract:
+        return self.contract(self.tokens[token_symbol], "TOKEN_ABI")
+
+    @property
+    def my_address(self) -> str:
+        return self.config.wallet_address
+
+    @property
+    def arbitrage_contract_address(self) -> str:
+        return self.config.arbitrage_contract_address
+
+    # --------------------------------------------------------------------------
+    # Helper Functions
+    # --------------------------------------------------------------------------
+    def get_decimals(self, token_symbol: str) -> int:
+        return self.registry.decimals(token_symbol)
+
+    def get_trade_size(self, token_symbol: str) -> int:
+        # For USDC-based trades, use 10 USDC (10_000_000 raw units).
+        if token_symbol == "MAGIC":
+            return self.config.trade_size_magic
+        return 10_000_000
+
+    # --------------------------------------------------------------------------
+    # Balance and allowance snapshots
+    # --------------------------------------------------------------------------
+    @property
+    def wallet(self) -> str:
+        return self.w3.eth.default_account or self.my_address
+
+    @property
+    def spenders(self) -> List[str]:
+        return [UNISWAP_V3_ROUTER, SUSHISWAP_ROUTER]
+
+    def refresh_balances(self, block: Optional[int] = None) -> BalanceSnapshot:
+        """
+        Reads every token balance and allowance of the wallet and the executor
+        contract in one batched call. A snapshot already taken at `block` is reused.
+        """
+        if block is not None and self.balances is not None and self.balances.block == block:
+            return self.balances
+        holders = [self.wallet]
+        tokens = list(self.tokens.values())
+        allowances = [(self.wallet, token, spender) for token in tokens for spender in self.spenders]
+        contract = self.arbitrage_contract_address
+        if contract:
+            holders.append(contract)
+            allowances += [(self.wallet, token, contract) for token in tokens]
+            allowances += [(contract, token, spender) for token in tokens for spender in self.spenders]
+            # The rescue check reads the contract's balance of both USDC addresses from the same snapshot.
+            tokens += [a for a in (self.config.correct_usdc_address, self.config.wrong_usdc_address) if a]
+        self.balances = take_balance_snapshot(self.w3, holders, tokens, allowances,
+                                              block if block is not None else "latest")
+        return self.balances
+
+    def current_balances(self) -> BalanceSnapshot:
+        return self.balances if self.balances is not None else self.refresh_balances()
+
+    def snapshot_balance(self, holder: str, token_symbol: str) -> int:
+        balance = self.current_balances().balance(holder, self.tokens[token_symbol])
+        if balance is None:
+            raise ValueError(f"{token_symbol} balance of {holder} missing from the balance snapshot")
+        return balance
+
+    def get_token_balance(self, token_symbol: str) -> float:
+        return self.get_raw_balance(token_symbol) / (10 ** self.get_decimals(token_symbol))
+
+    def get_raw_balance(self, token_symbol: str) -> int:
+        return self.snapshot_balance(self.wallet, token_symbol)
+
+    def has_collateral(self, route: str, balances: BalanceSnapshot) -> bool:
+        """Whether the executor contract holds at least the trade size of the route's start token."""
+        token = ROUTE_START_TOKEN[route]
+        balance = balances.balance(self.arbitrage_contract_address, self.tokens[token])
+        return balance is not None and balance >= self.get_trade_size(token)
+
+    def log_balances(self) -> None:
+        balances = self.current_balances()
+        logger.info(f"💰 Balances at block {balances.block}:")
+        holders = [("Wallet", self.wallet)]
+        if self.arbitrage_contract_address:
+            holders.append(("Contract", self.arbitrage_contract_address))
+        for label, holder in holders:
+            eth = balances.eth_balance(holder)
+            if eth is not None:
+                logger.info(f"💰 {label} ETH Balance: {self.w3.from_wei(eth, 'ether')} ETH")
+            for symbol, token in self.tokens.items():
+                raw = balances.balance(holder, token)
+                if raw is not None:
+                    logger.info(f"💰 {label} {symbol} Balance: {self.registry.to_human(symbol, raw)} {symbol}")
+        for (owner, token, spender), allowance in balances.allowances.items():
+            symbol = next((s for s, a in self.tokens.items() if a == token), token)
+            logger.info(f"🔓 Allowance {symbol} {owner} -> {spender}: {allowance}")
+
+    def check_balances(self) -> Tuple[float, float]:
+        try:
+            magic_balance = self.get_raw_balance("MAGIC")
+            usdc_balance = self.get_raw_balance("USDC")
+            magic_corrected = magic_balance / (10 ** self.get_decimals("MAGIC"))
+            usdc_corrected = usdc_balance / (10 ** self.get_decimals("USDC"))
+            logger.info(f"💰 Wallet MAGIC Balance: {magic_corrected} MAGIC")
+            logger.info(f"💰 Wallet USDC Balance: {usdc_corrected} USDC")
+            return magic_corrected, usdc_corrected
+        except Exception as e:
+            logger.error(f"Error checking wallet balances: {e}")
+            return 0, 0
+
+    def get_nonce(self) -> int:
+        if self._next_nonce is None:
+            time.sleep(0.5)
+            # Synced from the chain's pending count, never from a persisted value: a nonce handed
+            # to a relay that later dropped the transaction must be reused, not skipped. Private
+            # and bundle sends are invisible to our node, so nonces of transactions still awaiting
+            # a receipt are skipped until they are mined or expire.
+            chain_nonce = self.w3.eth.get_transaction_count(self.w3.eth.default_account, "pending")
+            in_flight = [nonce + 1 for _, _, nonce in self._pending_txs.values()]
+            self._next_nonce = max([chain_nonce] + in_flight)
+        return self._next_nonce
+
+    def mark_nonce_used(self, nonce: int) -> None:
+        self._next_nonce = nonce + 1
+        # Kept for the warm-start log only; get_nonce() never reads it back.
+        self.store.set_counter("last_nonce", nonce)
+
+    def reset_nonce(self) -> None:
+        """Forces the next get_nonce() to resync with the chain, e.g. after a failed send."""
+        self._next_nonce = None
+
+    def check_allowance(self, token_symbol: str, spender: str) -> int:
+        allowance = self.current_balances().allowance(self.wallet, self.tokens[token_symbol], spender)
+        if allowance is not None:
+            return allowance
+        return self.token_contract(token_symbol).functions.allowance(self.wallet, spender).call()
+
+    def approve_tokens_if_needed(self, token_symbol: str, spender: str, required_amount: int) -> None:
+        w3 = self.w3
+        current_allowance = self.check_allowance(token_symbol, spender)
+        if current_allowance >= required_amount:
+            logger.info(f"✅ Allowance for {token_symbol} on {spender} sufficient: {current_allowance}")
+            return
+        try:
+            nonce = self.get_nonce()
+            txn = self.token_contract(token_symbol).functions.approve(spender, required_amount).build_transaction({
+                'from': w3.eth.default_account,
+                'gas': 60000,
+                'gasPrice': int(w3.eth.gas_price * self.config.gas_multiplier),
                 'nonce': nonce,
             })
-        else:  # direction == "B"
-            logger.info("Executing Route B via smart contract: MAGIC → USDC on SushiSwap then USDC → MAGIC on Uniswap V3.")
-            txn = contract_instance.functions.executeArbitrageWithMagicReverse(trade_size).build_transaction({
-                'from': MY_ADDRESS,
-                'gas': 80000,
-                'gasPrice': int(w3.eth.gas_price * GAS_MULTIPLIER),
-                'nonce': nonce,
+            signed_txn = w3.eth.account.sign_transaction(txn, self.config.private_key)
+            tx_hash = w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+            self.mark_nonce_used(nonce)
+            # The allowance changes once the approval lands; force a fresh snapshot.
+            self.balances = None
+            logger.info(f"✅ Approved {token_symbol} spending on {spender}! TX Hash: {tx_hash.hex()}")
+        except Exception as e:
+            self.reset_nonce()
+            logger.error(f"Error approving tokens for {spender}: {e}")
+
+    def swap_on_uniswap_pair(self, token_in: str, token_out: str, amount_in_wei: int) -> Optional[str]:
+        w3 = self.w3
+        try:
+            balance = self.refresh_balances().balance(self.wallet, self.tokens[token_in]) or 0
+            if balance < amount_in_wei:
+                logger.error(f"❌ Insufficient {token_in} balance for Uniswap swap.")
+                return None
+            router_contract = self.contract(UNISWAP_V3_ROUTER, "UNISWAP_ROUTER_ABI")
+            self.refresh_pool_versions()
+            expected_uniswap_price, best_fee = self.get_uniswap_v3_price(amount_in_wei, token_in, token_out)
+            if expected_uniswap_price is None or best_fee is None:
+                logger.error(f"❌ Could not retrieve Uniswap price for {token_in} -> {token_out} swap with input {amount_in_wei}")
+                return None
+            decimals = self.get_decimals(token_out)
+            expected_out = int(expected_uniswap_price * (10 ** decimals))
+            amount_out_min = int(expected_out * self.config.slippage_tolerance)
+            logger.info(f"Uniswap {token_in}->{token_out} swap: best fee tier = {best_fee}, expected_out = {expected_out}, amountOutMinimum = {amount_out_min}")
+            base_fee = w3.eth.gas_price
+            max_priority_fee = w3.to_wei(2, 'gwei')
+            max_fee = base_fee + max_priority_fee
+            txn = router_contract.functions.exactInputSingle({
+                "tokenIn": self.tokens[token_in],
+                "tokenOut": self.tokens[token_out],
+                "fee": best_fee,
+                "recipient": self.my_address,
+                "deadline": int(time.time()) + 300,
+                "amountIn": amount_in_wei,
+                "amountOutMinimum": amount_out_min,
+                "sqrtPriceLimitX96": 0
+            }).build_transaction({
+                "from": self.my_address,
+                "gas": 80000,
+                "maxFeePerGas": max_fee,
+                "maxPriorityFeePerGas": max_priority_fee,
+                "nonce": self.get_nonce()
             })
-    elif direction in ["C", "D"]:
-        trade_size = get_trade_size("USDC")
-        if trade_size == 0:
-            logger.error("Trade size is 0 for USDC-based trade.")
+            return self.sign_and_send_transaction(txn)
+        except Exception as e:
+            self.reset_nonce()
+            logger.error(f"Error in swap_on_uniswap_pair ({token_in} -> {token_out}, input: {amount_in_wei}): {e}")
             return None
-        if direction == "C":
-            logger.info("Executing Route C via smart contract: USDC → MAGIC on Uniswap V3 then MAGIC → USDC on SushiSwap.")
-            txn = contract_instance.functions.executeArbitrageReverse(trade_size).build_transaction({
-                'from': MY_ADDRESS,
-                'gas': 80000,
-                'gasPrice': int(w3.eth.gas_price * GAS_MULTIPLIER),
-                'nonce': nonce,
+
+    def swap_on_sushiswap_pair(self, token_in: str, token_out: str, amount_in_wei: int) -> Optional[str]:
+        w3 = self.w3
+        try:
+            router_contract = self.contract(SUSHISWAP_ROUTER, "SUSHISWAP_ROUTER_ABI")
+            base_fee = w3.eth.gas_price
+            max_priority_fee = w3.to_wei(2, 'gwei')
+            max_fee = base_fee + max_priority_fee
+            txn = router_contract.functions.swapExactTokensForTokens(
+                amount_in_wei,
+                0,
+                [self.tokens[token_in], self.tokens[token_out]],
+                self.my_address,
+                int(time.time()) + 300
+            ).build_transaction({
+                "from": self.my_address,
+                "gas": 80000,
+                "maxFeePerGas": max_fee,
+                "maxPriorityFeePerGas": max_priority_fee,
+                "nonce": self.get_nonce()
+            })
+            signed_txn = w3.eth.account.sign_transaction(txn, self.config.private_key)
+            tx_hash = w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+            self.mark_nonce_used(txn["nonce"])
+            logger.info(f"✅ Transaction Sent! TX Hash: {tx_hash.hex()}")
+            return tx_hash.hex()
+        except Exception as e:
+            self.reset_nonce()
+            logger.error(f"Error in swap_on_sushiswap_pair ({token_in} -> {token_out}, input: {amount_in_wei}): {e}")
+            return None
+
+    def sign_and_send_transaction(self, txn: dict) -> Optional[str]:
+        w3 = self.w3
+        try:
+            base_fee = w3.eth.gas_price
+            max_priority_fee_per_gas = w3.to_wei(1, 'gwei')
+            max_fee_per_gas = base_fee + max_priority_fee_per_gas
+            txn.update({
+                'maxPriorityFeePerGas': max_priority_fee_per_gas,
+                'maxFeePerGas': max_fee_per_gas,
+                'nonce': self.get_nonce(),
+                'gas': w3.eth.estimate_gas(txn)
             })
-        else:  # direction == "D"
-            logger.info("Executing Route D via smart contract: USDC → MAGIC on SushiSwap then MAGIC → USDC on Uniswap V3.")
-            txn = contract_instance.functions.executeArbitrage(trade_size).build_transaction({
-                'from': MY_ADDRESS,
+            signed_txn = w3.eth.account.sign_transaction(txn, self.config.private_key)
+            tx_hash = w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+            self.mark_nonce_used(txn["nonce"])
+            logger.info(f"✅ Transaction Sent! TX Hash: {tx_hash.hex()}")
+            return tx_hash.hex()
+        except Exception as e:
+            self.reset_nonce()
+            logger.error(f"Error sending transaction: {e}")
+            return None
+
+    # --------------------------------------------------------------------------
+    # Quote Cache and Pool Snapshots
+    # --------------------------------------------------------------------------
+    def refresh_pool_versions(self, block: Optional[int] = None) -> Set[str]:
+        """
+        Invalidates cached quotes of pools with Sync/Swap/Mint/Burn events since
+        the last refresh and returns those pools. Refreshing the same block twice is free.
+        """
+        try:
+            changed = self.pool_versions.refresh(block)
+            if changed:
+                logger.debug("Pool state changed for %d pool(s); their cached quotes are stale.", len(changed))
+            return changed
+        except Exception as e:
+            # Without the logs the cache can't be trusted: bypass it until the next refresh.
+            logger.warning("Could not refresh pool versions, bypassing quote cache: %s", e)
+            self.pool_versions.invalidate()
+            return set(self.pool_versions.versions)
+
+    def cached_quote(self, venue: str, token_in: str, token_out: str, amount_in: int,
+                     fetch: Callable[[], int], fee: Optional[int] = None) -> int:
+        """Returns the pool's output for amount_in, calling fetch() only if the pool changed since it was cached."""
+        address = self.pool_address(venue, token_in, token_out, fee)
+        version = self.pool_versions.version(address) if address else None
+        amount_out = None
+        if version is not None:
+            amount_out = self.quote_cache.get(address, version, token_in, token_out, amount_in)
+        cached = amount_out is not None
+        if not cached:
+            amount_out = fetch()
+            if version is not None:
+                self.quote_cache.put(address, version, token_in, token_out, amount_in, amount_out)
+        self.record_quote(venue, token_in, token_out, amount_in, amount_out, fee)
+        if logger.isEnabledFor(logging.DEBUG):
+            log_event(logger, logging.DEBUG, QuoteEvent(venue, token_in, token_out, amount_in, amount_out,
+                                                        self.get_decimals(token_out), fee, cached))
+        return amount_out
+
+    def record_quote(self, venue: str, token_in: str, token_out: str, amount_in: int, amount_out: int,
+                     fee: Optional[int] = None) -> None:
+        quotes = self.cycle_quotes.setdefault(pool_key(venue, token_in, token_out, fee), {})
+        quotes[f"{token_in}>{token_out}:{amount_in}"] = amount_out
+
+    def save_pool_snapshots(self) -> None:
+        if not self.cycle_quotes:
+            return
+        try:
+            block = self.pool_versions.last_block
+            if block is None:
+                block = self.w3.eth.block_number
+            for pool, quotes in self.cycle_quotes.items():
+                address = self.pool_addresses.get(pool)
+                version = self.pool_versions.version(address) if address else None
+                self.store.save_snapshot(pool, block, {"version": version, "quotes": quotes})
+        except Exception as e:
+            logger.error("Error saving pool snapshots: %s", e)
+        finally:
+            self.cycle_quotes.clear()
+
+    # --------------------------------------------------------------------------
+    # Pricing
+    # --------------------------------------------------------------------------
+    def get_uniswap_v3_price(self, amount_in_wei: int, token_in: str, token_out: str) -> Tuple[Optional[float], Optional[int]]:
+        try:
+            uni_quoter = self.contract(UNISWAP_V3_QUOTER, "UNISWAP_QUOTER_ABI")
+            best_amount_out = 0
+            best_fee: Optional[int] = None
+            decimals_out = self.get_decimals(token_out)
+            for fee in self.active_fee_tiers(token_in, token_out):
+                try:
+                    amount_out = self.cached_quote(
+                        "uniswap_v3", token_in, token_out, amount_in_wei,
+                        uni_quoter.functions.quoteExactInputSingle(
+                            self.tokens[token_in],
+                            self.tokens[token_out],
+                            fee,
+                            amount_in_wei,
+                            0
+                        ).call,
+                        fee
+                    )
+                    if amount_out > best_amount_out:
+                        best_amount_out = amount_out
+                        best_fee = fee
+                except Exception as e:
+                    logger.error("Error quoting fee tier %s for %s -> %s with input %s: %s",
+                                 fee, token_in, token_out, amount_in_wei, e)
+                    continue
+            if best_amount_out:
+                computed_price = best_amount_out / (10 ** decimals_out)
+                logger.debug("Best fee tier: %s, computed price: %.6f for %s -> %s",
+                             best_fee, computed_price, token_in, token_out)
+                return computed_price, best_fee
+            else:
+                logger.error("No valid price retrieved for any fee tier.")
+                return None, None
+        except Exception as e:
+            logger.error("Error in get_uniswap_v3_price (%s->%s, input: %s): %s", token_in, token_out, amount_in_wei, e)
+            return None, None
+
+    def get_sushiswap_price(self, amount_in_wei: int, token_in: str, token_out: str) -> Optional[float]:
+        try:
+            router_contract = self.contract(SUSHISWAP_ROUTER, "SUSHISWAP_ROUTER_ABI")
+            get_amounts_out = router_contract.functions.getAmountsOut(
+                amount_in_wei, [self.tokens[token_in], self.tokens[token_out]]
+            )
+            amount_out = self.cached_quote("sushiswap", token_in, token_out, amount_in_wei,
+                                           lambda: get_amounts_out.call()[-1])
+            decimals_out = self.get_decimals(token_out)
+            return amount_out / (10 ** decimals_out)
+        except Exception as e:
+            logger.error("Error in get_sushiswap_price (%s -> %s, input: %s): %s", token_in, token_out, amount_in_wei, e)
+            return None
+
+    def estimate_total_gas_fee(self) -> float:
+        try:
+            total_gas = 80000
+            current_gas_price = self.w3.eth.gas_price
+            fee_in_wei = total_gas * current_gas_price
+            fee_in_eth = float(self.w3.from_wei(fee_in_wei, 'ether'))
+            return fee_in_eth
+        except Exception as e:
+            logger.error("Error estimating gas fee: %s", e)
+            return 0
+
+    # --------------------------------------------------------------------------
+    # Arbitrage Simulation and Execution with Four Routes
+    # --------------------------------------------------------------------------
+    @cached_property
+    def _trade_counters(self) -> dict:
+        # Restored from the state store so a restart doesn't reset the daily trade guard.
+        return {
+            "trade_count": self.store.get_counter("trade_count", 0),
+            "next_reset": datetime.fromtimestamp(
+                self.store.get_counter("next_reset", (datetime.now() + timedelta(days=1)).timestamp())
+            ),
+        }
+
+    @property
+    def trade_count(self) -> int:
+        return self._trade_counters["trade_count"]
+
+    @property
+    def next_reset(self) -> datetime:
+        return self._trade_counters["next_reset"]
+
+    def save_trade_counters(self) -> None:
+        self.store.set_counters({"trade_count": self.trade_count, "next_reset": self.next_reset.timestamp()})
+
+    def get_weth_to_usdc_rate(self) -> float:
+        """
+        Returns the conversion rate for 1 WETH to USDC (in human-readable USDC value).
+        """
+        amount_in = 10**18  # 1 WETH in wei
+        try:
+            quote, _ = self.get_uniswap_v3_price(amount_in, "WETH", "USDC")
+            return quote if quote is not None else 0
+        except Exception as e:
+            logger.error("Error getting WETH->USDC rate: %s", e)
+            return 0
+
+    def simulate_round_trip_arbitrage(self) -> dict:
+        get_decimals = self.get_decimals
+        get_uniswap_v3_price = self.get_uniswap_v3_price
+        get_sushiswap_price = self.get_sushiswap_price
+        results = {}
+        # ----- Routes starting with MAGIC (trade size for MAGIC) -----
+        magic_trade = self.get_trade_size("MAGIC")
+        initial_magic = magic_trade / (10 ** get_decimals("MAGIC"))
+
+        # Route A: MAGIC→USDC via Uniswap, then USDC→MAGIC via SushiSwap.
+        uni_usdc = get_uniswap_v3_price(magic_trade, "MAGIC", "USDC")
+        if uni_usdc[0] is None:
+            route_A_profit = None
+        else:
+            uni_usdc_amount = uni_usdc[0]
+            usdc_amount_wei_A = int(uni_usdc_amount * (10 ** get_decimals("USDC")))
+            sushi_magic_received = get_sushiswap_price(usdc_amount_wei_A, "USDC", "MAGIC")
+            route_A_profit = (sushi_magic_received - initial_magic) if sushi_magic_received is not None else None
+
+        # Route B: MAGIC→USDC via SushiSwap, then USDC→MAGIC via Uniswap.
+        sushi_usdc = get_sushiswap_price(magic_trade, "MAGIC", "USDC")
+        if sushi_usdc is None:
+            route_B_profit = None
+        else:
+            usdc_amount_wei_B = int(sushi_usdc * (10 ** get_decimals("USDC")))
+            uni_magic = get_uniswap_v3_price(usdc_amount_wei_B, "USDC", "MAGIC")
+            route_B_profit = (uni_magic[0] - initial_magic) if uni_magic[0] is not None else None
+
+        # ----- Routes starting with USDC (trade size for USDC) -----
+        usdc_trade = self.get_trade_size("USDC")
+        initial_usdc = usdc_trade / (10 ** get_decimals("USDC"))
+
+        # Route C: USDC→MAGIC via Uniswap, then MAGIC→USDC via SushiSwap.
+        uni_magic_for_usdc = get_uniswap_v3_price(usdc_trade, "USDC", "MAGIC")
+        if uni_magic_for_usdc[0] is None:
+            route_C_profit = None
+        else:
+            uni_magic_amount = uni_magic_for_usdc[0]
+            magic_amount_wei = int(uni_magic_amount * (10 ** get_decimals("MAGIC")))
+            sushi_usdc_received = get_sushiswap_price(magic_amount_wei, "MAGIC", "USDC")
+            route_C_profit = (sushi_usdc_received - initial_usdc) if sushi_usdc_received is not None else None
+
+        # Route D: USDC→MAGIC via SushiSwap, then MAGIC→USDC via Uniswap.
+        sushi_magic_for_usdc = get_sushiswap_price(usdc_trade, "USDC", "MAGIC")
+        if sushi_magic_for_usdc is None:
+            route_D_profit = None
+        else:
+            magic_amount_wei = int(sushi_magic_for_usdc * (10 ** get_decimals("MAGIC")))
+            uni_usdc_for_usdc = get_uniswap_v3_price(magic_amount_wei, "MAGIC", "USDC")
+            route_D_profit = (uni_usdc_for_usdc[0] - initial_usdc) if uni_usdc_for_usdc[0] is not None else None
+
+        # For routes A and B, convert profit (in MAGIC) to USDC.
+        magic_to_usdc_rate, _ = get_uniswap_v3_price(10**18, "MAGIC", "USDC")
+        if magic_to_usdc_rate is None:
+            magic_to_usdc_rate = 1
+        route_A_profit_usdc = route_A_profit * magic_to_usdc_rate if route_A_profit is not None else None
+        route_B_profit_usdc = route_B_profit * magic_to_usdc_rate if route_B_profit is not None else None
+
+        # Routes C and D are already in USDC terms.
+        net_profit_A = route_A_profit_usdc
+        net_profit_B = route_B_profit_usdc
+        net_profit_C = route_C_profit
+        net_profit_D = route_D_profit
+
+        # Estimate gas fee in ETH and convert to USDC.
+        gas_fee_eth = self.estimate_total_gas_fee()
+        weth_to_usdc_rate = self.get_weth_to_usdc_rate()
+        gas_fee_usdc = gas_fee_eth * weth_to_usdc_rate
+
+        net_profit_A = net_profit_A - gas_fee_usdc if net_profit_A is not None else None
+        net_profit_B = net_profit_B - gas_fee_usdc if net_profit_B is not None else None
+        net_profit_C = net_profit_C - gas_fee_usdc if net_profit_C is not None else None
+        net_profit_D = net_profit_D - gas_fee_usdc if net_profit_D is not None else None
+
+        results["A"] = net_profit_A
+        results["B"] = net_profit_B
+        results["C"] = net_profit_C
+        results["D"] = net_profit_D
+        for route, net_profit in results.items():
+            if net_profit is not None:
+                logger.info("Route %s (%s): Net profit = %.2f USDC", route, ROUTE_DESCRIPTIONS[route], net_profit)
+            else:
+                logger.info("Route %s simulation failed.", route)
+        return results
+
+    def reset_trade_counter_if_needed(self) -> None:
+        if datetime.now() >= self.next_reset:
+            self._trade_counters["trade_count"] = 0
+            self._trade_counters["next_reset"] = datetime.now() + timedelta(days=1)
+            self.save_trade_counters()
+            logger.info("Trade counter reset for new day.")
+
+    # --------------------------------------------------------------------------
+    # Contract balances
+    # --------------------------------------------------------------------------
+    def get_contract_usdc_balance(self) -> float:
+        try:
+            balance = self.snapshot_balance(self.arbitrage_contract_address, "USDC")
+            contract_balance = balance / (10 ** self.get_decimals("USDC"))
+            logger.info(f"💰 Contract USDC Balance: {contract_balance} USDC")
+            return contract_balance
+        except Exception as e:
+            logger.error(f"Error checking contract USDC balance: {e}")
+            return 0
+
+    def get_contract_magic_balance(self) -> float:
+        try:
+            balance = self.snapshot_balance(self.arbitrage_contract_address, "MAGIC")
+            contract_balance = balance / (10 ** self.get_decimals("MAGIC"))
+            logger.info(f"💰 Contract MAGIC Balance: {contract_balance} MAGIC")
+            return contract_balance
+        except Exception as e:
+            logger.error(f"Error checking contract MAGIC balance: {e}")
+            return 0
+
+    # --------------------------------------------------------------------------
+    # Trade Execution: Call the Smart Contract Directly
+    # --------------------------------------------------------------------------
+    def execute_arbitrage_trade(self, direction: str, block: Optional[int] = None) -> Optional[str]:
+        w3 = self.w3
+        contract_instance = self.contract(self.arbitrage_contract_address, "ARBITRAGE_CONTRACT_ABI")
+
+        # Mapping based on direction:
+        # Route A: MAGIC-based → executeArbitrageWithMagic
+        # Route B: MAGIC-based reverse → executeArbitrageWithMagicReverse
+        # Route C: USDC-based → executeArbitrageReverse
+        # Route D: USDC-based → executeArbitrage
+        if direction in ["A", "B"]:
+            trade_size = self.get_trade_size("MAGIC")
+            if trade_size == 0:
+                logger.error("Trade size is 0 for MAGIC-based trade.")
+                return None
+            if direction == "A":
+                logger.info("Executing Route A via smart contract: MAGIC → USDC on Uniswap V3 then USDC → MAGIC on SushiSwap.")
+                fn = contract_instance.functions.executeArbitrageWithMagic(trade_size)
+            else:  # direction == "B"
+                logger.info("Executing Route B via smart contract: MAGIC → USDC on SushiSwap then USDC → MAGIC on Uniswap V3.")
+                fn = contract_instance.functions.executeArbitrageWithMagicReverse(trade_size)
+        elif direction in ["C", "D"]:
+            trade_size = self.get_trade_size("USDC")
+            if trade_size == 0:
+                logger.error("Trade size is 0 for USDC-based trade.")
+                return None
+            if direction == "C":
+                logger.info("Executing Route C via smart contract: USDC → MAGIC on Uniswap V3 then MAGIC → USDC on SushiSwap.")
+                fn = contract_instance.functions.executeArbitrageReverse(trade_size)
+            else:  # direction == "D"
+                logger.info("Executing Route D via smart contract: USDC → MAGIC on SushiSwap then MAGIC → USDC on Uniswap V3.")
+                fn = contract_instance.functions.executeArbitrage(trade_size)
+        else:
+            logger.error("Invalid direction specified for arbitrage trade.")
+            return None
+
+        try:
+            submitter = self.submitter
+            # Private and bundle submissions skip the public gas auction, so they use their own multiplier.
+            gas_multiplier = (self.config.gas_multiplier if submitter.name == "public"
+                              else self.config.mev_gas_multiplier)
+            nonce = self.get_nonce()
+            txn = fn.build_transaction({
+                'from': self.my_address,
                 'gas': 80000,
-                'gasPrice': int(w3.eth.gas_price * GAS_MULTIPLIER),
+                'gasPrice': int(w3.eth.gas_price * gas_multiplier),
                 'nonce': nonce,
             })
-    else:
-        logger.error("Invalid direction specified for arbitrage trade.")
-        return None
-
-    signed_txn = w3.eth.account.sign_transaction(txn, PRIVATE_KEY)
-    tx_hash = w3.eth.send_raw_transaction(signed_txn.rawTransaction)
-    logger.info(f"✅ Arbitrage transaction sent via contract! TX Hash: {tx_hash.hex()}")
-    return tx_hash.hex()
-
-def check_and_execute_arbitrage() -> None:
-    global trade_count
-    reset_trade_counter_if_needed()
-
-    route_profits = simulate_round_trip_arbitrage()
-    valid_routes = {k: v for k, v in route_profits.items() if v is not None}
-    if not valid_routes:
-        logger.info("No valid arbitrage route simulation available.")
-        return
-
-    best_route = max(valid_routes, key=valid_routes.get)
-    best_profit = valid_routes[best_route]
-    logger.info(f"Best arbitrage route: {best_route} with net profit {best_profit:.2f} USDC.")
-
-    if best_profit > 0:
-        # Check the appropriate contract collateral based on the route.
-        if best_route in ["A", "B"]:
-            if get_contract_magic_balance() == 0:
-                logger.warning("⚠️ Contract MAGIC balance is zero! Stopping arbitrage trades.")
+            signed_txn = w3.eth.account.sign_transaction(txn, self.config.private_key)
+            tx_hash = submitter.submit(signed_txn.rawTransaction, signed_txn.hash.hex())
+        except Exception as e:
+            self.reset_nonce()
+            logger.error("Error sending arbitrage transaction for Route %s: %s", direction, e)
+            return None
+        if tx_hash is None:
+            self.reset_nonce()
+            logger.error("❌ Arbitrage transaction was not accepted by the %s submission path.", submitter.name)
+            return None
+        self.mark_nonce_used(nonce)
+        self._pending_txs[tx_hash] = (direction, block, nonce)
+        log_event(trade_logger, logging.INFO, SendEvent(direction, tx_hash, submitter.name, nonce, trade_size))
+        return tx_hash
+
+    def cancel_submissions(self) -> None:
+        """Stops relay retries still running and withdraws a bundle still targeting future blocks, e.g. on shutdown."""
+        if "submitter" in self.__dict__:
+            self.submitter.cancel()
+
+    def check_pending_receipts(self, block: Optional[int] = None) -> None:
+        """
+        Logs a receipt event for every sent arbitrage transaction that has been
+        mined since the last check, and a dropped one for every transaction
+        still without a receipt pending_tx_expiry_blocks after it was sent.
+        """
+        if block is None:
+            try:
+                block = self.w3.eth.block_number
+            except Exception as e:
+                logger.warning("Could not read the block number for receipt checks: %s", e)
                 return
-        elif best_route in ["C", "D"]:
-            if get_contract_usdc_balance() == 0:
-                logger.warning("⚠️ Contract USDC balance is zero! Stopping arbitrage trades.")
+        for tx_hash, (route, sent_block, nonce) in list(self._pending_txs.items()):
+            try:
+                receipt = self.w3.eth.get_transaction_receipt(tx_hash)
+            except Exception:
+                if sent_block is None:
+                    # Sent outside the block feed: start counting from the first check.
+                    self._pending_txs[tx_hash] = (route, block, nonce)
+                elif block - sent_block >= self.config.pending_tx_expiry_blocks:
+                    del self._pending_txs[tx_hash]
+                    log_event(trade_logger, logging.WARNING, ReceiptEvent(route, tx_hash, None, block))
+                    # Probably dropped by a relay: resync so its nonce is reused instead of
+                    # leaving every later transaction behind a gap.
+                    self.reset_nonce()
+                continue
+            del self._pending_txs[tx_hash]
+            level = logging.INFO if receipt["status"] == 1 else logging.WARNING
+            log_event(trade_logger, level, ReceiptEvent(route, tx_hash, receipt["status"],
+                                                        receipt["blockNumber"], receipt["gasUsed"]))
+
+    def detect_opportunities(self, block: Optional[int] = None, seen_at: Optional[float] = None) -> List[dict]:
+        """
+        Runs the full detection pipeline once and returns one record per route
+        that could be simulated. seen_at is the perf_counter() timestamp when
+        the block was observed; detection latency is measured from it.
+        """
+        if seen_at is None:
+            seen_at = time.perf_counter()
+        self.refresh_pool_versions(block)
+        route_profits = self.simulate_round_trip_arbitrage()
+        self.save_pool_snapshots()
+        cache = self.quote_cache
+        logger.debug("Quote cache: %d hits, %d misses (%.0f%%), %d entries",
+                     cache.hits, cache.misses, cache.hit_rate * 100, len(cache))
+        latency_ms = (time.perf_counter() - seen_at) * 1000
+        detected_at = time.time()
+        return [
+            {
+                "block": block,
+                "route": route,
+                "description": ROUTE_DESCRIPTIONS[route],
+                "token_in": ROUTE_START_TOKEN[route],
+                "size": self.get_trade_size(ROUTE_START_TOKEN[route]),
+                "expected_profit_usdc": profit,
+                "profitable": profit > 0,
+                "latency_ms": round(latency_ms, 1),
+                "detected_at": detected_at,
+            }
+            for route, profit in route_profits.items() if profit is not None
+        ]
+
+    def check_and_execute_arbitrage(self, opportunities: Optional[List[dict]] = None) -> None:
+        """Picks the best route and trades it. Pass opportunities to reuse an existing detection."""
+        if self._pending_txs:
+            self.check_pending_receipts(opportunities[0]["block"] if opportunities else None)
+        self.reset_trade_counter_if_needed()
+        max_trades = self.config.max_trades_per_day
+        if self.trade_count >= max_trades:
+            logger.info("Daily trade limit of %d reached; waiting until %s.", max_trades, self.next_reset.replace(microsecond=0))
+            return
+
+        if not self.arbitrage_contract_address:
+            logger.error("ARBITRAGE_CONTRACT_ADDRESS is not set; cannot execute trades.")
+            return
+
+        if opportunities is None:
+            opportunities = self.detect_opportunities()
+        valid_routes = {o["route"]: o["expected_profit_usdc"] for o in opportunities}
+        if not valid_routes:
+            logger.info("No valid arbitrage route simulation available.")
+            return
+        block = opportunities[0]["block"]
+
+        # Collateral is checked before selection, so an unfunded route never hides a funded one.
+        try:
+            balances = self.refresh_balances(block)
+        except Exception as e:
+            logger.error("Error taking balance snapshot, skipping this cycle: %s", e)
+            return
+        funded = {route: profit for route, profit in valid_routes.items() if self.has_collateral(route, balances)}
+        best_route = max(funded or valid_routes, key=valid_routes.get)
+        best_profit = valid_routes[best_route]
+
+        if best_profit <= 0:
+            log_event(logger, logging.INFO, DecisionEvent(best_route, best_profit, "skip", "not profitable", block))
+        elif best_route not in funded:
+            token = ROUTE_START_TOKEN[best_route]
+            log_event(logger, logging.WARNING, DecisionEvent(
+                best_route, best_profit, "skip", f"contract {token} balance below trade size", block))
+        else:
+            log_event(logger, logging.INFO, DecisionEvent(best_route, best_profit, "trade", "profitable", block))
+            # Only accepted transactions count towards the daily limit; a rejected send or a
+            # bundle that missed its blocks leaves the quota untouched.
+            if self.execute_arbitrage_trade(best_route, block) is None:
                 return
+            self._trade_counters["trade_count"] += 1
+            self.save_trade_counters()
+            logger.info("Trade count for today: %d", self.trade_count)
 
-        logger.info(f"💰 Profitable arbitrage opportunity detected (Route {best_route}). Triggering trade.")
-        execute_arbitrage_trade(best_route)
-        trade_count += 1
-        logger.info(f"Trade executed. Trade count for today: {trade_count}")
-    else:
-        logger.info("⚖️ No profitable arbitrage opportunity detected based on simulation.")
+    # --------------------------------------------------------------------------
+    # SushiSwap MAGIC/USDC pool address
+    # --------------------------------------------------------------------------
+    def print_sushiswap_pool_address(self) -> None:
+        logger.info(f"SushiSwap MAGIC/USDC pool address: {self.pool_address('sushiswap', 'MAGIC', 'USDC')}")
 
-# ------------------------------------------------------------------------------
-# Function to print the SushiSwap MAGIC/USDC pool address
-# ------------------------------------------------------------------------------
-def print_sushiswap_pool_address() -> None:
-    SUSHISWAP_FACTORY_ADDRESS = Web3.to_checksum_address("0xc35DADB65012eC5796536bD9864eD8773aBc74C4")
-    SUSHISWAP_FACTORY_ABI = '''[
-        {
-            "constant": true,
-            "inputs": [
-                {"internalType": "address", "name": "", "type": "address"},
-                {"internalType": "address", "name": "", "type": "address"}
-            ],
-            "name": "getPair",
-            "outputs": [{"internalType": "address", "name": "", "type": "address"}],
-            "payable": false,
-            "stateMutability": "view",
-            "type": "function"
-        }
-    ]'''
-    factory_contract = w3.eth.contract(address=SUSHISWAP_FACTORY_ADDRESS, abi=json.loads(SUSHISWAP_FACTORY_ABI))
-    pool_address = factory_contract.functions.getPair(TOKENS["MAGIC"], TOKENS["USDC"]).call()
-    logger.info(f"SushiSwap MAGIC/USDC pool address: {pool_address}")
+    # --------------------------------------------------------------------------
+    # Warm Start and Main Loop
+    # --------------------------------------------------------------------------
+    def log_warm_start(self) -> None:
+        logger.info(f"♻️ Restored state from {self.config.state_db_path}: trade_count={self.trade_count}, "
+                    f"next_reset={self.next_reset:%Y-%m-%d %H:%M}, last_nonce={self.store.get_counter('last_nonce')}")
+        for pool, snapshot in self.store.load_snapshots().items():
+            age = time.time() - snapshot["updated_at"]
+            logger.info(f"♻️ Snapshot for {pool}: block {snapshot['block']}, "
+                        f"{len(snapshot['state']['quotes'])} quotes, {age:.0f}s old")
+        self.pool_versions
+        if len(self.quote_cache):
+            logger.info(f"♻️ Quote cache seeded with {len(self.quote_cache)} quotes from snapshots")
 
-# ------------------------------------------------------------------------------
-# Logging Filter for Successful Transactions
-# ------------------------------------------------------------------------------
-class SuccessFilter(logging.Filter):
-    def filter(self, record: logging.LogRecord) -> bool:
-        msg = record.getMessage()
-        return ("Trade executed" in msg) or ("Arbitrage transaction sent" in msg)
-
-success_handler = logging.FileHandler('successful_transactions.log')
-success_handler.setLevel(logging.INFO)
-success_handler.addFilter(SuccessFilter())
-formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s')
-success_handler.setFormatter(formatter)
-logger.addHandler(success_handler)
+    def prepare(self) -> None:
+        self.log_warm_start()
+        self.print_sushiswap_pool_address()
+        self.refresh_fee_tiers()
 
-# ------------------------------------------------------------------------------
-# Main Execution
-# ------------------------------------------------------------------------------
-if __name__ == "__main__":
-    print_sushiswap_pool_address()
-    while True:
-        check_and_execute_arbitrage()
-        time.sleep(10)
+    def run_on_blocks(self, execute: bool = True, stream: Optional[OpportunityStream] = None,
+                      max_blocks: Optional[int] = None, poll_interval: float = 0.25,
+                      scheduler: Optional[AdaptiveScheduler] = None) -> None:
+        """
+        Evaluates new blocks. Detection runs at most once per block and its
+        result is shared: it is written to the shadow stream (if any) and, when
+        execute is set, acted on by the live path. Without a scheduler every
+        block is evaluated; with one, only the blocks it schedules within the
+        RPC budget.
+        """
+        feed = BlockSubscription(self.w3, poll_interval, self.rpc_budget if scheduler is not None else None)
+
+        def evaluate(block: int, seen_at: float) -> List[dict]:
+            opportunities = self.detect_opportunities(block, seen_at)
+            if stream is not None:
+                stream.emit(opportunities)
+            if execute:
+                self.check_and_execute_arbitrage(opportunities)
+            return opportunities
+
+        def on_block(block: int, seen_at: float) -> None:
+            if scheduler is None:
+                evaluate(block, seen_at)
+                return
+            changed = self.refresh_pool_versions(block) if scheduler.should_refresh(block) else set()
+            for target in scheduler.due(block, changed):
+                used_before = self.rpc_budget.used
+                opportunities = evaluate(block, seen_at)
+                best_profit = max((o["expected_profit_usdc"] for o in opportunities), default=None)
+                scheduler.record(target, block, best_profit, self.rpc_budget.used - used_before)
+            scheduler.maybe_report()
+
+        feed.subscribe(on_block)
+        try:
+            feed.run(max_blocks)
+        finally:
+            if scheduler is not None:
+                scheduler.report()
+            if stream is not None:
+                logger.info(f"🕶️ Shadow stream {stream.path}: {stream.records} records, "
+                            f"{stream.profitable} profitable, {feed.skipped_blocks} blocks skipped, "
+                            f"quote cache hit rate {self.quote_cache.hit_rate:.0%}")
+                stream.close()
+
+    def run(self, max_cycles: Optional[int] = None) -> None:
+        cycles = 0
+        while True:
+            self.check_and_execute_arbitrage()
+            cycles += 1
+            if max_cycles is not None and cycles >= max_cycles:
+                return
+            time.sleep(self.config.scan_interval)
@@ -0,0 +1,84 @@
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from web3 import Web3
+
+from .abis import load_abi
+from .multicall import MULTICALL3_ABI, MULTICALL3_ADDRESS, multicall
+
+
+# ------------------------------------------------------------------------------
+# Balance Snapshot: every balance and allowance the bot cares about, in one call
+# ------------------------------------------------------------------------------
+@dataclass
+class BalanceSnapshot:
+    """
+    Raw balances and allowances read at one block, keyed by checksummed
+    addresses. Values that could not be read are missing, so lookups return
+    None rather than a misleading zero.
+    """
+
+    block: int
+    taken_at: float
+    eth: Dict[str, int] = field(default_factory=dict)
+    balances: Dict[Tuple[str, str], int] = field(default_factory=dict)
+    allowances: Dict[Tuple[str, str, str], int] = field(default_factory=dict)
+
+    def eth_balance(self, holder: str) -> Optional[int]:
+        return self.eth.get(Web3.to_checksum_address(holder))
+
+    def balance(self, holder: str, token: str) -> Optional[int]:
+        return self.balances.get((Web3.to_checksum_address(holder), Web3.to_checksum_address(token)))
+
+    def allowance(self, owner: str, token: str, spender: str) -> Optional[int]:
+        key = tuple(Web3.to_checksum_address(a) for a in (owner, token, spender))
+        return self.allowances.get(key)
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.taken_at
+
+
+def take_balance_snapshot(w3: Web3, holders: Iterable[str], tokens: Iterable[str],
+                          allowances: Iterable[Tuple[str, str, str]] = (),
+                          block_identifier: Any = "latest") -> BalanceSnapshot:
+    """
+    Reads the ETH balance of every holder, the balance of every (holder, token)
+    and every (owner, token, spender) allowance in a single Multicall3 eth_call,
+    together with the block number it was evaluated at.
+    """
+    holders = [Web3.to_checksum_address(h) for h in holders]
+    tokens = [Web3.to_checksum_address(t) for t in tokens]
+    allowances = [tuple(Web3.to_checksum_address(a) for a in triple) for triple in allowances]
+    aggregator = w3.eth.contract(address=MULTICALL3_ADDRESS, abi=json.loads(MULTICALL3_ABI))
+    token_contracts = {t: w3.eth.contract(address=t, abi=load_abi("TOKEN_ABI")) for t in tokens}
+    for _, token, _ in allowances:
+        token_contracts.setdefault(token, w3.eth.contract(address=token, abi=load_abi("TOKEN_ABI")))
+
+    keys: List[tuple] = [("block",)]
+    calls = [aggregator.functions.getBlockNumber()]
+    for holder in holders:
+        keys.append(("eth", holder))
+        calls.append(aggregator.functions.getEthBalance(holder))
+        for token in tokens:
+            keys.append(("balance", holder, token))
+            calls.append(token_contracts[token].functions.balanceOf(holder))
+    for owner, token, spender in allowances:
+        keys.append(("allowance", owner, token, spender))
+        calls.append(token_contracts[token].functions.allowance(owner, spender))
+
+    results = multicall(w3, calls, block_identifier)
+    block = results[0] if results[0] is not None else block_identifier
+    snapshot = BalanceSnapshot(block=block, taken_at=time.time())
+    for key, value in zip(keys[1:], results[1:]):
+        if value is None:
+            continue
+        if key[0] == "eth":
+            snapshot.eth[key[1]] = value
+        elif key[0] == "balance":
+            snapshot.balances[key[1:]] = value
+        else:
+            snapshot.allowances[key[1:]] = value
+    return snapshot
@@ -0,0 +1,66 @@
+import logging
+import time
+from typing import Callable, List, Optional
+
+from web3 import Web3
+
+from .scheduler import RpcBudget, method_cost
+
+logger = logging.getLogger(__name__)
+
+# Called with (block_number, seen_at) where seen_at is time.perf_counter() when
+# the block was first observed, so consumers can measure detection latency.
+BlockConsumer = Callable[[int, float], None]
+
+
+# ------------------------------------------------------------------------------
+# Block Subscription: one new-block poller shared by every consumer
+# ------------------------------------------------------------------------------
+class BlockSubscription:
+    """
+    Polls eth_blockNumber and hands each new block to every subscribed
+    consumer in turn. If consumers take longer than a block, intermediate
+    blocks are skipped and the latest one is processed next. With a budget,
+    polling pauses while the RPC budget is exhausted.
+    """
+
+    def __init__(self, w3: Web3, poll_interval: float = 0.25, budget: Optional[RpcBudget] = None) -> None:
+        self.w3 = w3
+        self.poll_interval = poll_interval
+        self.budget = budget
+        self.consumers: List[BlockConsumer] = []
+        self.last_block: Optional[int] = None
+        self.skipped_blocks = 0
+
+    def subscribe(self, consumer: BlockConsumer) -> None:
+        self.consumers.append(consumer)
+
+    def poll(self) -> Optional[int]:
+        block = self.w3.eth.block_number
+        if self.last_block is not None and block <= self.last_block:
+            return None
+        seen_at = time.perf_counter()
+        if self.last_block is not None and block > self.last_block + 1:
+            self.skipped_blocks += block - self.last_block - 1
+        self.last_block = block
+        for consumer in self.consumers:
+            try:
+                consumer(block, seen_at)
+            except Exception as e:
+                logger.error(f"Error in block consumer for block {block}: {e}")
+        return block
+
+    def run(self, max_blocks: Optional[int] = None) -> None:
+        processed = 0
+        while max_blocks is None or processed < max_blocks:
+            if self.budget is not None:
+                wait = self.budget.wait_time(method_cost("eth_blockNumber"))
+                if wait > 0:
+                    time.sleep(wait)
+            try:
+                if self.poll() is not None:
+                    processed += 1
+                    continue
+            except Exception as e:
+                logger.error(f"Error polling block number: {e}")
+            time.sleep(self.poll_interval)
@@ -0,0 +1,188 @@
+import argparse
+import logging
+import sys
+import time
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# ------------------------------------------------------------------------------
+# Cold-start timing
+# ------------------------------------------------------------------------------
+class StartupTimer:
+    """Records named phases relative to process start and prints them on request."""
+
+    def __init__(self, start: Optional[float] = None) -> None:
+        self.start = start if start is not None else time.perf_counter()
+        self.last = self.start
+        self.phases: List[Tuple[str, float]] = []
+
+    def mark(self, name: str) -> None:
+        now = time.perf_counter()
+        self.phases.append((name, (now - self.last) * 1000))
+        self.last = now
+
+    def report(self) -> None:
+        total = (self.last - self.start) * 1000
+        logger.info("⏱️ Cold-start timing:")
+        for name, elapsed_ms in self.phases:
+            logger.info(f"⏱️   {name:<20} {elapsed_ms:9.1f} ms")
+        logger.info(f"⏱️   {'total':<20} {total:9.1f} ms")
+
+
+# ------------------------------------------------------------------------------
+# Commands
+# ------------------------------------------------------------------------------
+def cmd_run(bot, args: argparse.Namespace, timer: StartupTimer) -> None:
+    bot.prepare()
+    timer.mark("warm start")
+    if args.fixed_interval:
+        bot.check_and_execute_arbitrage()
+        timer.mark("first cycle")
+        if args.timing:
+            timer.report()
+        time.sleep(bot.config.scan_interval)
+        bot.run()
+        return
+    stream = None
+    if args.shadow_out:
+        # Live trading and the shadow stream share one block feed and one detection per block.
+        from .shadow import OpportunityStream
+
+        stream = OpportunityStream(args.shadow_out)
+    if args.timing:
+        timer.report()
+    bot.run_on_blocks(execute=True, stream=stream, poll_interval=args.poll_interval, scheduler=bot.scheduler)
+
+
+def cmd_quote(bot, args: argparse.Namespace, timer: StartupTimer) -> None:
+    for cycle in range(args.cycles):
+        opportunities = bot.detect_opportunities()
+        if cycle == 0:
+            timer.mark("first quote")
+            if args.timing:
+                timer.report()
+        valid_routes = {o["route"]: o["expected_profit_usdc"] for o in opportunities}
+        if valid_routes:
+            best_route = max(valid_routes, key=valid_routes.get)
+            logger.info(f"Best arbitrage route: {best_route} with net profit {valid_routes[best_route]:.2f} USDC "
+                        f"(quote-only, not executed).")
+        if cycle + 1 < args.cycles:
+            time.sleep(bot.config.scan_interval)
+
+
+def cmd_shadow(bot, args: argparse.Namespace, timer: StartupTimer) -> None:
+    from .shadow import OpportunityStream
+
+    bot.prepare()
+    timer.mark("warm start")
+    if args.timing:
+        timer.report()
+    bot.run_on_blocks(execute=False, stream=OpportunityStream(args.out), max_blocks=args.blocks,
+                      poll_interval=args.poll_interval, scheduler=bot.scheduler if args.adaptive else None)
+
+
+def cmd_balances(bot, args: argparse.Namespace, timer: StartupTimer) -> None:
+    bot.refresh_balances()
+    timer.mark("balances")
+    bot.log_balances()
+    if args.timing:
+        timer.report()
+
+
+def cmd_rescue(bot, args: argparse.Namespace, timer: StartupTimer) -> None:
+    from .withdraw import check_rescue_balances
+
+    config = bot.config
+    correct = args.correct_usdc or config.correct_usdc_address
+    wrong = args.wrong_usdc or config.wrong_usdc_address
+    if not config.arbitrage_contract_address or not correct or not wrong:
+        logger.error("Missing one or more required settings: ARBITRAGE_CONTRACT_ADDRESS, "
+                     "CORRECT_USDC_ADDRESS, WRONG_USDC_ADDRESS")
+        sys.exit(1)
+    check_rescue_balances(bot.w3, config.arbitrage_contract_address, correct, wrong, bot.refresh_balances())
+    timer.mark("rescue check")
+    if args.timing:
+        timer.report()
+
+
+def cmd_decimals(bot, args: argparse.Namespace, timer: StartupTimer) -> None:
+    from .magic_get_decimals import MAGIC_ADDRESS, get_token_metadata
+
+    symbol, decimals = get_token_metadata(bot.w3, bot.store, args.address or MAGIC_ADDRESS)
+    print("Symbol of token:", symbol)
+    print("Decimals of token:", decimals)
+    timer.mark("decimals")
+    if args.timing:
+        timer.report()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m bot", description="Arbitrum MAGIC/USDC arbitrage bot")
+    parser.add_argument("--timing", action="store_true", help="log cold-start timing per startup phase")
+    parser.add_argument("--log-level", default="INFO", help="logging level (default: INFO)")
+    parser.add_argument("--log-json", action="store_true", help="log one JSON object per line, with event fields")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="scan and execute arbitrage trades (adaptive, within the RPC budget)")
+    run.add_argument("--shadow-out", help="also stream every evaluated opportunity as JSONL to this file "
+                                          "('-' for stdout)")
+    run.add_argument("--fixed-interval", action="store_true",
+                     help="scan every SCAN_INTERVAL seconds instead of using the adaptive scheduler")
+    run.add_argument("--poll-interval", type=float, default=0.25, help="block poll interval in seconds")
+    run.set_defaults(handler=cmd_run)
+
+    quote = sub.add_parser("quote", help="simulate all routes without executing")
+    quote.add_argument("--cycles", type=int, default=1, help="number of quote cycles (default: 1)")
+    quote.set_defaults(handler=cmd_quote)
+
+    shadow = sub.add_parser("shadow", help="stream every opportunity per block as JSONL, never execute")
+    shadow.add_argument("--out", default="-", help="JSONL output file (default: stdout)")
+    shadow.add_argument("--blocks", type=int, help="stop after this many blocks")
+    shadow.add_argument("--poll-interval", type=float, default=0.25, help="block poll interval in seconds")
+    shadow.add_argument("--adaptive", action="store_true",
+                        help="evaluate only the blocks the adaptive scheduler picks within the RPC budget")
+    shadow.set_defaults(handler=cmd_shadow)
+
+    sub.add_parser("balances", help="wallet and contract token balances").set_defaults(handler=cmd_balances)
+
+    rescue = sub.add_parser("rescue", help="check contract balances of the correct vs. mistaken USDC")
+    rescue.add_argument("--correct-usdc", help="defaults to CORRECT_USDC_ADDRESS")
+    rescue.add_argument("--wrong-usdc", help="defaults to WRONG_USDC_ADDRESS")
+    rescue.set_defaults(handler=cmd_rescue)
+
+    decimals = sub.add_parser("decimals", help="symbol and decimals of a token (default: MAGIC)")
+    decimals.add_argument("address", nargs="?")
+    decimals.set_defaults(handler=cmd_decimals)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None, start: Optional[float] = None) -> None:
+    timer = StartupTimer(start)
+    args = build_parser().parse_args(argv)
+
+    from .arbitrage_bot_magic_usdc import ArbitrageBot
+    from .config import load_config
+    from .log_pipeline import configure_logging
+
+    configure_logging(getattr(logging, args.log_level.upper(), logging.INFO), json_output=args.log_json)
+    timer.mark("imports")
+    try:
+        bot = ArbitrageBot(load_config())
+    except ValueError as e:
+        logger.error(f"❌ Invalid configuration: {e}")
+        sys.exit(1)
+    timer.mark("config")
+    try:
+        bot.w3
+        timer.mark("connect")
+        bot.registry
+        timer.mark("token registry")
+    except ConnectionError as e:
+        logger.error(f"❌ {e}")
+        sys.exit(1)
+    try:
+        args.handler(bot, args, timer)
+    finally:
+        bot.cancel_submissions()
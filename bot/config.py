@@ -0,0 +1,131 @@
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from web3 import Web3
+
+# ------------------------------------------------------------------------------
+# Contract and Token Addresses (MAGIC and USDC)
+# ------------------------------------------------------------------------------
+UNISWAP_V3_QUOTER: str = Web3.to_checksum_address("0xb27308f9F90D607463bb33eA1BeBb41C27CE5AB6")
+UNISWAP_V3_ROUTER: str = Web3.to_checksum_address("0xE592427A0AEce92De3Edee1F18E0157C05861564")
+SUSHISWAP_ROUTER: str = Web3.to_checksum_address("0x1b02da8cb0d097eb8d57a175b88c7d8b47997506")
+SUSHISWAP_FACTORY: str = Web3.to_checksum_address("0xc35DADB65012eC5796536bD9864eD8773aBc74C4")
+UNISWAP_V3_FACTORY: str = Web3.to_checksum_address("0x1F98431c8aD98523631AE4a59f267346ea31F984")
+
+# Uniswap V3 fee tiers quoted for every pair.
+FEE_TIERS: List[int] = [100, 500, 3000, 10000]
+
+# Set the tokens (decimals are discovered on-chain by the token registry):
+# - MAGIC: your MAGIC token address
+# - USDC: common Arbitrum USDC address
+TOKENS: Dict[str, str] = {
+    "MAGIC": Web3.to_checksum_address("0x539bdE0d7Dbd336b79148AA742883198BBF60342"),
+    "USDC":  Web3.to_checksum_address("0xFF970A61A04b1cA14834A43f5dE4533eBDDB5CC8"),
+    "WETH":  Web3.to_checksum_address("0x82AF49447d8a07e3bd95bd0d56f35241523fbab1")
+
+}
+
+# Token pairs the bot quotes: MAGIC/USDC for the routes, WETH/USDC for gas conversion.
+QUOTED_PAIRS: List[Tuple[str, str]] = [("MAGIC", "USDC"), ("WETH", "USDC")]
+
+
+# ------------------------------------------------------------------------------
+# Configurable Parameters (via environment variables)
+# ------------------------------------------------------------------------------
+@dataclass
+class BotConfig:
+    arbitrum_rpc: Optional[str] = None
+    private_key: Optional[str] = None
+    wallet_address: Optional[str] = None
+    arbitrage_contract_address: Optional[str] = None  # Deployed contract
+
+    slippage_tolerance: float = 0.98
+    gas_multiplier: float = 1.3
+    trade_size_magic: int = 50000000
+    min_profit_threshold_usdt: float = 0.01
+    max_trades_per_day: int = 10
+    scan_interval: float = 10.0
+
+    # Submission path for arbitrage transactions: "public", "private" or "bundle".
+    submission_mode: str = "public"
+    private_relay_urls: List[str] = field(default_factory=list)
+    bundle_target_blocks: int = 3
+    relay_timeout: float = 2.0
+    relay_max_retries: int = 2
+    mev_gas_multiplier: float = 1.3
+    # A sent transaction without a receipt after this many blocks is logged as dropped and no longer polled.
+    pending_tx_expiry_blocks: int = 240
+
+    # Quote cache: LRU size and amount bucket width (0 = exact amounts only).
+    quote_cache_size: int = 4096
+    quote_cache_bucket_bps: float = 0
+
+    # Uniswap V3 fee tiers are re-discovered this often (seconds); tiers whose in-range
+    # liquidity is below this share of the pair's deepest tier are not quoted.
+    fee_tier_refresh_interval: float = 3600.0
+    fee_tier_min_liquidity_share: float = 0.01
+
+    # Adaptive scheduler: RPC compute-unit budget (0 = unlimited) and evaluation cadence.
+    rpc_budget_per_second: float = 330.0
+    rpc_budget_burst: Optional[float] = None  # defaults to 2x the rate
+    scheduler_max_interval_blocks: int = 40
+    escalate_margin_usdc: float = 0.05
+    budget_report_interval: float = 60.0
+
+    # Local run-state database (trade counters, nonce, pools, snapshots) for warm restarts.
+    state_db_path: str = "bot_state.sqlite3"
+
+    # USDC addresses used by the rescue tooling.
+    correct_usdc_address: Optional[str] = None
+    wrong_usdc_address: Optional[str] = None
+
+    tokens: Dict[str, str] = field(default_factory=lambda: dict(TOKENS))
+
+
+def validate_submission(config: BotConfig) -> None:
+    """Raises ValueError for a submission mode the bot could not trade with, before any trade is attempted."""
+    from .submission import SUBMISSION_MODES
+
+    if config.submission_mode not in SUBMISSION_MODES:
+        raise ValueError(f"Unknown SUBMISSION_MODE '{config.submission_mode}', expected one of {SUBMISSION_MODES}")
+    if config.submission_mode != "public" and not config.private_relay_urls:
+        raise ValueError(f"SUBMISSION_MODE={config.submission_mode} requires PRIVATE_RELAY_URLS")
+
+
+def load_config() -> BotConfig:
+    """Reads .env and the process environment into a BotConfig. Makes no network calls."""
+    load_dotenv()
+    gas_multiplier = float(os.getenv("GAS_MULTIPLIER", "1.3"))
+    config = BotConfig(
+        arbitrum_rpc=os.getenv("ARBITRUM_RPC"),
+        private_key=os.getenv("PRIVATE_KEY"),
+        wallet_address=os.getenv("WALLET_ADDRESS"),
+        arbitrage_contract_address=os.getenv("ARBITRAGE_CONTRACT_ADDRESS"),
+        slippage_tolerance=float(os.getenv("SLIPPAGE_TOLERANCE", "0.98")),
+        gas_multiplier=gas_multiplier,
+        trade_size_magic=int(os.getenv("TRADE_SIZE_MAGIC", "50000000").replace(",", "")),
+        scan_interval=float(os.getenv("SCAN_INTERVAL", "10")),
+        submission_mode=os.getenv("SUBMISSION_MODE", "public").lower(),
+        private_relay_urls=[u.strip() for u in os.getenv("PRIVATE_RELAY_URLS", "").split(",") if u.strip()],
+        bundle_target_blocks=int(os.getenv("BUNDLE_TARGET_BLOCKS", "3")),
+        relay_timeout=float(os.getenv("RELAY_TIMEOUT", "2.0")),
+        relay_max_retries=int(os.getenv("RELAY_MAX_RETRIES", "2")),
+        mev_gas_multiplier=float(os.getenv("MEV_GAS_MULTIPLIER", str(gas_multiplier))),
+        pending_tx_expiry_blocks=int(os.getenv("PENDING_TX_EXPIRY_BLOCKS", "240")),
+        quote_cache_size=int(os.getenv("QUOTE_CACHE_SIZE", "4096")),
+        quote_cache_bucket_bps=float(os.getenv("QUOTE_CACHE_BUCKET_BPS", "0")),
+        fee_tier_refresh_interval=float(os.getenv("FEE_TIER_REFRESH_INTERVAL", "3600")),
+        fee_tier_min_liquidity_share=float(os.getenv("FEE_TIER_MIN_LIQUIDITY_SHARE", "0.01")),
+        rpc_budget_per_second=float(os.getenv("RPC_BUDGET_PER_SECOND", "330")),
+        rpc_budget_burst=float(os.environ["RPC_BUDGET_BURST"]) if os.getenv("RPC_BUDGET_BURST") else None,
+        scheduler_max_interval_blocks=int(os.getenv("SCHEDULER_MAX_INTERVAL_BLOCKS", "40")),
+        escalate_margin_usdc=float(os.getenv("ESCALATE_MARGIN_USDC", "0.05")),
+        budget_report_interval=float(os.getenv("BUDGET_REPORT_INTERVAL", "60")),
+        state_db_path=os.getenv("STATE_DB_PATH", "bot_state.sqlite3"),
+        correct_usdc_address=os.getenv("CORRECT_USDC_ADDRESS"),
+        wrong_usdc_address=os.getenv("WRONG_USDC_ADDRESS"),
+    )
+    validate_submission(config)
+    return config
@@ -0,0 +1,300 @@
+"""
+Local HTTP relay stand-in for exercising the private/bundle submission paths
+without touching a real relay. Run it on its own:
+
+    python -m bot.local_relay --port 8545 --latency 0.05 --fail-rate 0.2
+
+or let it benchmark the submission backends against a few stand-in relays:
+
+    python -m bot.local_relay --bench --relays 3 --latency 0.05 --fail-rate 0.3
+
+The stand-ins share a simulated chain that produces blocks on a timer, lands
+accepted bundles at their target block with probability --inclusion-rate and
+answers eth_blockNumber / eth_getTransactionReceipt, so the bundle path runs
+end to end.
+"""
+import argparse
+import json
+import logging
+import random
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from web3 import Web3
+
+from .submission import BundleBackend, PrivateRelayBackend
+
+logger = logging.getLogger(__name__)
+
+
+class LocalChain:
+    """Block clock and bundle inclusion shared by every stand-in relay of a bench."""
+
+    def __init__(self, block_time: float = 0.25, inclusion_rate: float = 1.0, start_block: int = 1_000_000) -> None:
+        self.block_time = block_time
+        self.inclusion_rate = inclusion_rate
+        self.start_block = start_block
+        self._started = time.monotonic()
+        # tx hash -> (block it lands in, replacementUuid of the bundle that carries it)
+        self.landed: Dict[str, Tuple[int, Optional[str]]] = {}
+        self.cancelled_bundles: set = set()
+        self._lock = threading.Lock()
+
+    @property
+    def block_number(self) -> int:
+        return self.start_block + int((time.monotonic() - self._started) / self.block_time)
+
+    def include(self, bundle: dict) -> None:
+        # Each accepted (bundle, target block) lands with probability inclusion_rate.
+        if random.random() >= self.inclusion_rate:
+            return
+        target = int(bundle["blockNumber"], 16)
+        with self._lock:
+            for raw in bundle["txs"]:
+                tx_hash = Web3.to_hex(Web3.keccak(hexstr=raw))
+                if tx_hash not in self.landed or self.landed[tx_hash][0] > target:
+                    self.landed[tx_hash] = (target, bundle.get("replacementUuid"))
+
+    def cancel(self, replacement_uuid: str) -> None:
+        with self._lock:
+            self.cancelled_bundles.add(replacement_uuid)
+
+    def receipt(self, tx_hash: str) -> Optional[dict]:
+        with self._lock:
+            block, replacement_uuid = self.landed.get(tx_hash, (None, None))
+            if block is None or block > self.block_number or replacement_uuid in self.cancelled_bundles:
+                return None
+        return {
+            "transactionHash": tx_hash,
+            "blockHash": "0x" + f"{block:064x}",
+            "blockNumber": hex(block),
+            "transactionIndex": "0x0",
+            "cumulativeGasUsed": hex(21000),
+            "gasUsed": hex(21000),
+            "logs": [],
+            "status": "0x1",
+        }
+
+
+class LocalRelayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], latency: float = 0.0, fail_rate: float = 0.0,
+                 chain: Optional[LocalChain] = None) -> None:
+        super().__init__(address, LocalRelayHandler)
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.chain = chain or LocalChain()
+        self.received: List[dict] = []
+        self._lock = threading.Lock()
+
+    def count(self, method: str) -> int:
+        with self._lock:
+            return sum(1 for request in self.received if request.get("method") == method)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class LocalRelayHandler(BaseHTTPRequestHandler):
+    server: LocalRelayServer
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        with self.server._lock:
+            self.server.received.append(request)
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if random.random() < self.server.fail_rate:
+            self.send_error(503, "Relay overloaded")
+            return
+        self._reply(request.get("id"), *self._dispatch(request.get("method"), request.get("params") or []))
+
+    def _dispatch(self, method: str, params: list) -> Tuple[object, dict]:
+        if method in ("eth_sendRawTransaction", "eth_sendPrivateTransaction"):
+            raw = params[0] if isinstance(params[0], str) else params[0]["tx"]
+            return Web3.to_hex(Web3.keccak(hexstr=raw)), None
+        if method == "eth_sendBundle":
+            bundle = params[0]
+            if bundle.get("replacementUuid") in self.server.chain.cancelled_bundles:
+                return None, {"code": -32000, "message": "bundle cancelled"}
+            self.server.chain.include(bundle)
+            body = "".join(bundle["txs"]) + bundle["blockNumber"]
+            return {"bundleHash": Web3.to_hex(Web3.keccak(text=body))}, None
+        if method == "eth_cancelBundle":
+            self.server.chain.cancel(params[0]["replacementUuid"])
+            return None, None
+        if method == "eth_blockNumber":
+            return hex(self.server.chain.block_number), None
+        if method == "eth_getTransactionReceipt":
+            return self.server.chain.receipt(params[0]), None
+        if method == "eth_chainId":
+            return hex(42161), None
+        return None, {"code": -32601, "message": f"method {method} not found"}
+
+    def _reply(self, request_id, result, error) -> None:
+        body = {"jsonrpc": "2.0", "id": request_id}
+        if error is not None:
+            body["error"] = error
+        else:
+            body["result"] = result
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug(format % args)
+
+
+def start_local_relay(host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                      fail_rate: float = 0.0, chain: Optional[LocalChain] = None) -> LocalRelayServer:
+    """Starts a stand-in relay on a background thread. Port 0 picks a free port."""
+    server = LocalRelayServer((host, port), latency, fail_rate, chain)
+    threading.Thread(target=server.serve_forever, name=f"local-relay-{server.server_address[1]}",
+                     daemon=True).start()
+    return server
+
+
+def bench_private(servers: List[LocalRelayServer], rounds: int, latency: float, max_retries: int) -> None:
+    backend = PrivateRelayBackend([s.url for s in servers], timeout=max(1.0, latency * 10),
+                                  max_retries=max_retries, retry_backoff=0.01)
+    latencies: List[float] = []
+    failures = 0
+    for i in range(rounds):
+        raw_tx = i.to_bytes(32, "big")
+        start = time.perf_counter()
+        result = backend.submit(raw_tx, Web3.to_hex(Web3.keccak(raw_tx)))
+        elapsed = (time.perf_counter() - start) * 1000
+        if result is None:
+            failures += 1
+        else:
+            latencies.append(elapsed)
+
+    total_requests = sum(s.count("eth_sendRawTransaction") for s in servers)
+    if latencies:
+        print(f"[private] accepted={len(latencies)} failed={failures} "
+              f"p50={statistics.median(latencies):.1f}ms max={max(latencies):.1f}ms")
+    else:
+        print(f"[private] accepted=0 failed={failures}")
+    print(f"[private] relay requests={total_requests} (incl. retries)")
+
+
+def bench_bundle(servers: List[LocalRelayServer], chain: LocalChain, rounds: int, latency: float,
+                 max_retries: int, target_blocks: int) -> None:
+    # The chain node is a stand-in that never fails, so only relay submissions see errors.
+    node = start_local_relay(chain=chain)
+    w3 = Web3(Web3.HTTPProvider(node.url))
+    backend = BundleBackend(w3, [s.url for s in servers], target_blocks, timeout=max(1.0, latency * 10),
+                            max_retries=max_retries, retry_backoff=0.01, poll_interval=chain.block_time / 4)
+    latencies: List[float] = []
+    missed = 0
+    for i in range(rounds):
+        raw_tx = (1_000_000 + i).to_bytes(32, "big")
+        start = time.perf_counter()
+        result = backend.submit(raw_tx, Web3.to_hex(Web3.keccak(raw_tx)))
+        elapsed = (time.perf_counter() - start) * 1000
+        if result is None:
+            missed += 1
+        else:
+            latencies.append(elapsed)
+
+    bundles = sum(s.count("eth_sendBundle") for s in servers)
+    if latencies:
+        print(f"[bundle] landed={len(latencies)} missed={missed} within {target_blocks} blocks, "
+              f"p50={statistics.median(latencies):.1f}ms max={max(latencies):.1f}ms to inclusion")
+    else:
+        print(f"[bundle] landed=0 missed={missed} within {target_blocks} blocks")
+    print(f"[bundle] eth_sendBundle requests={bundles} (incl. retries)")
+
+    # Cancel check: a bundle that would never land is withdrawn from every relay mid-window.
+    inclusion_rate, chain.inclusion_rate = chain.inclusion_rate, 0.0
+    slow_backend = BundleBackend(w3, [s.url for s in servers], target_blocks=40,
+                                 poll_interval=chain.block_time / 4)
+    timer = threading.Timer(chain.block_time * 2, slow_backend.cancel)
+    timer.start()
+    start = time.perf_counter()
+    result = slow_backend.submit(b"\xff" * 32, Web3.to_hex(Web3.keccak(b"\xff" * 32)))
+    cancel_ms = (time.perf_counter() - start) * 1000
+    timer.join()
+    chain.inclusion_rate = inclusion_rate
+    print(f"[bundle] cancelled 40-block bundle returned {result} after {cancel_ms:.1f}ms, "
+          f"eth_cancelBundle sent to {sum(1 for s in servers if s.count('eth_cancelBundle'))}/{len(servers)} relays")
+    node.shutdown()
+
+
+def bench_cancel() -> None:
+    # A relay that always fails must stop retrying once cancelled.
+    dead = start_local_relay(fail_rate=1.0)
+    slow_backend = PrivateRelayBackend([dead.url], max_retries=50, retry_backoff=0.05)
+    threading.Timer(0.1, slow_backend.cancel).start()
+    start = time.perf_counter()
+    slow_backend.submit(b"\x00", "0x00")
+    cancel_ms = (time.perf_counter() - start) * 1000
+    print(f"[cancel] cancel took {cancel_ms:.1f}ms after {len(dead.received)} attempts")
+
+    # Retries a previous submission left in the background (one relay accepted, one keeps
+    # failing) stop when the next submission starts and stay stopped.
+    good = start_local_relay()
+    dead.received.clear()
+    backend = PrivateRelayBackend([good.url, dead.url], max_retries=50, retry_backoff=0.02)
+    backend.submit(b"\x01", "0x01")
+    time.sleep(0.2)
+    backend.submit(b"\x02", "0x02")
+    backend.cancel()
+    time.sleep(0.2)
+    settled = len(dead.received)
+    time.sleep(0.5)
+    print(f"[cancel] background retries after the next submission and cancel(): {len(dead.received) - settled}")
+    for server in (dead, good):
+        server.shutdown()
+
+
+def run_bench(relays: int, rounds: int, latency: float, fail_rate: float, max_retries: int,
+              block_time: float = 0.25, inclusion_rate: float = 0.5, target_blocks: int = 3) -> None:
+    chain = LocalChain(block_time, inclusion_rate)
+    servers = [start_local_relay(latency=latency * (i + 1), fail_rate=fail_rate, chain=chain)
+               for i in range(relays)]
+    print(f"relays={relays} rounds={rounds} latency={latency * 1000:.0f}ms fail_rate={fail_rate:.0%} "
+          f"block_time={block_time * 1000:.0f}ms inclusion_rate={inclusion_rate:.0%}")
+    bench_private(servers, rounds, latency, max_retries)
+    # Each bundle round waits up to target_blocks blocks, so fewer of them.
+    bench_bundle(servers, chain, max(1, rounds // 5), latency, max_retries, target_blocks)
+    bench_cancel()
+    for server in servers:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s [%(levelname)s] %(message)s')
+    parser = argparse.ArgumentParser(description="Local JSON-RPC relay stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8545)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--bench", action="store_true",
+                        help="benchmark the private and bundle backends against stand-ins")
+    parser.add_argument("--relays", type=int, default=3)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--max-retries", type=int, default=2)
+    parser.add_argument("--block-time", type=float, default=0.25, help="simulated block time in seconds")
+    parser.add_argument("--inclusion-rate", type=float, default=0.5,
+                        help="chance an accepted bundle lands in its target block")
+    parser.add_argument("--target-blocks", type=int, default=3, help="blocks each bundle targets")
+    args = parser.parse_args()
+
+    if args.bench:
+        run_bench(args.relays, args.rounds, args.latency, args.fail_rate, args.max_retries,
+                  args.block_time, args.inclusion_rate, args.target_blocks)
+    else:
+        relay = LocalRelayServer((args.host, args.port), args.latency, args.fail_rate)
+        print(f"Local relay listening on {relay.url}")
+        relay.serve_forever()
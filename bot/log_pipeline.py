@@ -0,0 +1,153 @@
+import atexit
+import json
+import logging
+import queue
+import sys
+from dataclasses import asdict, dataclass
+from logging.handlers import QueueHandler, QueueListener
+from typing import ClassVar, Optional
+
+# Trade events (sends and receipts) are logged here and only this logger feeds the trade log.
+TRADE_LOGGER = f"{__package__}.trades"
+TRADE_LOG_PATH = "successful_transactions.log"
+
+
+# ------------------------------------------------------------------------------
+# Typed log events
+# ------------------------------------------------------------------------------
+# Events are passed as the log message itself, so str() (the human-readable
+# form) only runs when a handler formats the record, on the listener thread.
+@dataclass(frozen=True)
+class QuoteEvent:
+    kind: ClassVar[str] = "quote"
+    venue: str
+    token_in: str
+    token_out: str
+    amount_in: int
+    amount_out: int
+    decimals_out: int
+    fee: Optional[int] = None
+    cached: bool = False
+
+    def __str__(self) -> str:
+        tier = f" fee tier {self.fee}" if self.fee is not None else ""
+        source = " (cached)" if self.cached else ""
+        return (f"{self.venue}{tier}: {self.amount_in} {self.token_in} -> {self.amount_out} "
+                f"({self.amount_out / 10 ** self.decimals_out:.6f}) {self.token_out}{source}")
+
+
+@dataclass(frozen=True)
+class DecisionEvent:
+    kind: ClassVar[str] = "decision"
+    route: str
+    expected_profit_usdc: float
+    action: str  # "trade" or "skip"
+    reason: str
+    block: Optional[int] = None
+
+    def __str__(self) -> str:
+        icon = "💰" if self.action == "trade" else "⚖️"
+        return (f"{icon} Best arbitrage route: {self.route} with net profit {self.expected_profit_usdc:.2f} USDC "
+                f"-> {self.action} ({self.reason})")
+
+
+@dataclass(frozen=True)
+class SendEvent:
+    kind: ClassVar[str] = "send"
+    route: str
+    tx_hash: str
+    backend: str
+    nonce: int
+    trade_size: int
+
+    def __str__(self) -> str:
+        return (f"✅ Arbitrage transaction sent via contract ({self.backend})! Route {self.route}, "
+                f"size {self.trade_size}, nonce {self.nonce}, TX Hash: {self.tx_hash}")
+
+
+@dataclass(frozen=True)
+class ReceiptEvent:
+    """A mined transaction, or (status None) one dropped without a receipt by `block`."""
+
+    kind: ClassVar[str] = "receipt"
+    route: str
+    tx_hash: str
+    status: Optional[int]
+    block: int
+    gas_used: Optional[int] = None
+
+    @property
+    def dropped(self) -> bool:
+        return self.status is None
+
+    def __str__(self) -> str:
+        if self.dropped:
+            return (f"⚠️ Arbitrage transaction {self.tx_hash} (Route {self.route}) dropped: "
+                    f"no receipt by block {self.block}")
+        outcome = "✅ succeeded" if self.status == 1 else "❌ reverted"
+        return (f"Arbitrage transaction {self.tx_hash} (Route {self.route}) {outcome} in block {self.block}, "
+                f"gas used {self.gas_used}")
+
+
+def log_event(logger: logging.Logger, level: int, event: object) -> None:
+    logger.log(level, event, extra={"event": event})
+
+
+# ------------------------------------------------------------------------------
+# Queue-based pipeline
+# ------------------------------------------------------------------------------
+class DeferredQueueHandler(QueueHandler):
+    """
+    Enqueues records as they are. The stock QueueHandler formats the message
+    on the logging thread; here formatting and all I/O happen on the listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class EventFormatter(logging.Formatter):
+    """Plain text by default; with json_output, one JSON object per record including the event fields."""
+
+    def __init__(self, json_output: bool = False) -> None:
+        super().__init__('%(asctime)s [%(levelname)s] %(message)s')
+        self.json_output = json_output
+
+    def format(self, record: logging.LogRecord) -> str:
+        if not self.json_output:
+            return super().format(record)
+        payload = {"ts": record.created, "level": record.levelname, "logger": record.name}
+        event = getattr(record, "event", None)
+        if event is not None:
+            payload["event"] = event.kind
+            payload.update(asdict(event))
+        payload["message"] = record.getMessage()
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def configure_logging(level: int = logging.INFO, json_output: bool = False,
+                      trade_log_path: str = TRADE_LOG_PATH) -> QueueListener:
+    """
+    Routes all logging through a queue to a background listener that writes
+    the console (stderr) and the trade log. Called by the CLI, never at import.
+    The listener is stopped, and the queue drained, at interpreter exit.
+    """
+    console = logging.StreamHandler(sys.stderr)
+    console.setLevel(level)
+    console.setFormatter(EventFormatter(json_output))
+
+    trade_handler = logging.FileHandler(trade_log_path, delay=True)
+    trade_handler.setLevel(logging.INFO)
+    trade_handler.addFilter(logging.Filter(TRADE_LOGGER))
+    trade_handler.setFormatter(EventFormatter(json_output))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logging.basicConfig(level=level, handlers=[DeferredQueueHandler(log_queue)])
+    # Trades reach the trade log even when the console is set to a quieter level.
+    logging.getLogger(TRADE_LOGGER).setLevel(logging.INFO)
+    listener = QueueListener(log_queue, console, trade_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
@@ -0,0 +1,174 @@
+"""
+Rate-limited stand-in for an Alchemy-style RPC endpoint, for exercising the
+adaptive scheduler without spending real compute units. It produces blocks on
+a timer, emits pool-state logs at random and answers any request with HTTP
+429-style errors once its compute-unit budget is spent.
+
+Compare every-block evaluation with the adaptive scheduler against it:
+
+    python -m bot.mock_provider --seconds 20 --limit 330 --calls-per-eval 10
+"""
+import argparse
+import logging
+import random
+import time
+from typing import Any, Callable, List, Optional
+
+from web3 import Web3
+from web3.providers.base import BaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+from .block_feed import BlockSubscription
+from .quote_cache import SYNC_TOPIC, PoolVersionTracker
+from .scheduler import AdaptiveScheduler, RpcBudget, rpc_budget_middleware
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_ERROR = {"code": 429, "message": "Your app has exceeded its compute units per second capacity"}
+
+
+class RateLimitedProvider(BaseProvider):
+    """
+    Answers eth_blockNumber, eth_getLogs, eth_gasPrice, eth_call and
+    eth_chainId from a simulated chain, debiting each request from its own
+    compute-unit bucket. Requests beyond the limit fail and are counted in
+    rate_limited.
+    """
+
+    def __init__(self, limit: float = 330.0, burst: Optional[float] = None, block_time: float = 0.25,
+                 activity: float = 0.1, start_block: int = 1_000_000,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        super().__init__()
+        self.limiter = RpcBudget(limit, burst, clock)
+        self.block_time = block_time
+        self.activity = activity
+        self.start_block = start_block
+        self.clock = clock
+        self._started = clock()
+        self.requests = 0
+        self.rate_limited = 0
+
+    @property
+    def block_number(self) -> int:
+        return self.start_block + int((self.clock() - self._started) / self.block_time)
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        return True
+
+    def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        self.requests += 1
+        if not self.limiter.try_debit(method):
+            self.rate_limited += 1
+            return {"jsonrpc": "2.0", "id": self.requests, "error": RATE_LIMIT_ERROR}
+        return {"jsonrpc": "2.0", "id": self.requests, "result": self._dispatch(method, params)}
+
+    def _dispatch(self, method: str, params: Any) -> Any:
+        if method == "eth_blockNumber":
+            return hex(self.block_number)
+        if method == "eth_chainId":
+            return hex(42161)
+        if method == "eth_gasPrice":
+            return hex(10 ** 8)
+        if method == "eth_call":
+            return "0x" + "00" * 32
+        if method == "eth_getLogs":
+            return self._logs(params[0])
+        return None
+
+    def _logs(self, log_filter: dict) -> List[dict]:
+        addresses = log_filter.get("address") or []
+        if isinstance(addresses, str):
+            addresses = [addresses]
+        from_block = int(log_filter["fromBlock"], 16) if isinstance(log_filter["fromBlock"], str) \
+            else log_filter["fromBlock"]
+        to_block = int(log_filter["toBlock"], 16) if isinstance(log_filter["toBlock"], str) \
+            else log_filter["toBlock"]
+        logs = []
+        for block in range(from_block, to_block + 1):
+            for address in addresses:
+                if random.random() < self.activity:
+                    logs.append({
+                        "address": address,
+                        "topics": [SYNC_TOPIC],
+                        "data": "0x",
+                        "blockNumber": hex(block),
+                        "blockHash": "0x" + f"{block:064x}",
+                        "transactionHash": "0x" + f"{block:064x}",
+                        "transactionIndex": "0x0",
+                        "logIndex": hex(len(logs)),
+                        "removed": False,
+                    })
+        return logs
+
+
+def run_bench(seconds: float, limit: float, budget_rate: float, block_time: float, calls_per_eval: int,
+              activity: float, pools: int) -> None:
+    """Runs every-block evaluation and then the adaptive scheduler against a fresh stand-in each."""
+    pool_addresses = [Web3.to_checksum_address(f"0x{i + 1:040x}") for i in range(pools)]
+    max_blocks = int(seconds / block_time)
+
+    for label, adaptive in (("every block", False), ("adaptive", True)):
+        provider = RateLimitedProvider(limit, block_time=block_time, activity=activity)
+        budget = RpcBudget(budget_rate if adaptive else 0)
+        w3 = Web3(provider)
+        w3.middleware_onion.add(rpc_budget_middleware(budget), "rpc_budget")
+        tracker = PoolVersionTracker(w3)
+        for address in pool_addresses:
+            tracker.watch(address)
+        scheduler = AdaptiveScheduler(budget, report_interval=seconds * 2)
+        target = scheduler.add_target("pair", pool_addresses)
+        feed = BlockSubscription(w3, block_time, budget if adaptive else None)
+        failures = [0]
+
+        def evaluate() -> Optional[float]:
+            try:
+                for _ in range(calls_per_eval):
+                    w3.eth.call({"to": pool_addresses[0], "data": "0x"})
+            except Exception:
+                failures[0] += 1
+                return None
+            # Spreads are usually negative; pool activity occasionally opens one up.
+            return random.gauss(0.0, 0.03) if random.random() < 0.1 else random.gauss(-0.3, 0.05)
+
+        def on_block(block: int, seen_at: float) -> None:
+            changed = set()
+            if not adaptive or scheduler.should_refresh(block):
+                try:
+                    changed = tracker.refresh(block)
+                except Exception:
+                    failures[0] += 1
+            if not adaptive:
+                evaluate()
+                return
+            for due in scheduler.due(block, changed):
+                used_before = budget.used
+                scheduler.record(due, block, evaluate(), budget.used - used_before)
+
+        feed.subscribe(on_block)
+        started = time.monotonic()
+        feed.run(max_blocks)
+        elapsed = time.monotonic() - started
+        summary = scheduler.report() if adaptive else None
+        evaluations = summary["evaluations"] if summary else max_blocks
+        print(f"[{label}] {elapsed:.1f}s, {max_blocks} blocks, {evaluations} evaluations, "
+              f"{provider.limiter.used / elapsed:.0f} CU/s served (limit {limit:.0f}), "
+              f"{provider.rate_limited} rate-limited requests, {failures[0]} failed evaluations/refreshes")
+        if summary:
+            print(f"[{label}] escalations={summary['escalations']} backoffs={summary['backoffs']} "
+                  f"deferred={summary['deferred']} final interval={target.interval} blocks")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s [%(levelname)s] %(message)s')
+    parser = argparse.ArgumentParser(description="Rate-limited RPC stand-in and scheduler benchmark")
+    parser.add_argument("--seconds", type=float, default=20.0, help="duration of each run")
+    parser.add_argument("--limit", type=float, default=330.0, help="provider compute units per second")
+    parser.add_argument("--budget", type=float, help="scheduler budget in CU/s (default: 90%% of --limit)")
+    parser.add_argument("--block-time", type=float, default=0.25)
+    parser.add_argument("--calls-per-eval", type=int, default=10, help="eth_calls per evaluation")
+    parser.add_argument("--activity", type=float, default=0.05, help="chance a pool changes in a block")
+    parser.add_argument("--pools", type=int, default=5)
+    args = parser.parse_args()
+
+    run_bench(args.seconds, args.limit, args.budget or args.limit * 0.9, args.block_time, args.calls_per_eval,
+              args.activity, args.pools)
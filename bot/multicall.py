@@ -0,0 +1,93 @@
+import json
+from typing import Any, List, Optional
+
+from eth_abi import decode, encode
+from eth_utils import function_abi_to_4byte_selector
+from eth_utils.abi import collapse_if_tuple
+from web3 import Web3
+from web3.contract.contract import ContractFunction
+
+# ------------------------------------------------------------------------------
+# Multicall3: batch many view calls into a single eth_call
+# ------------------------------------------------------------------------------
+# Deployed at the same address on Arbitrum One and most other EVM chains.
+MULTICALL3_ADDRESS: str = Web3.to_checksum_address("0xcA11bde05977b3631167028862bE2a173976CA11")
+
+MULTICALL3_ABI = '''[
+  {
+    "inputs": [
+      {
+        "components": [
+          {"internalType": "address", "name": "target", "type": "address"},
+          {"internalType": "bool", "name": "allowFailure", "type": "bool"},
+          {"internalType": "bytes", "name": "callData", "type": "bytes"}
+        ],
+        "internalType": "struct Multicall3.Call3[]",
+        "name": "calls",
+        "type": "tuple[]"
+      }
+    ],
+    "name": "aggregate3",
+    "outputs": [
+      {
+        "components": [
+          {"internalType": "bool", "name": "success", "type": "bool"},
+          {"internalType": "bytes", "name": "returnData", "type": "bytes"}
+        ],
+        "internalType": "struct Multicall3.Result[]",
+        "name": "returnData",
+        "type": "tuple[]"
+      }
+    ],
+    "stateMutability": "payable",
+    "type": "function"
+  },
+  {
+    "inputs": [{"internalType": "address", "name": "addr", "type": "address"}],
+    "name": "getEthBalance",
+    "outputs": [{"internalType": "uint256", "name": "balance", "type": "uint256"}],
+    "stateMutability": "view",
+    "type": "function"
+  },
+  {
+    "inputs": [],
+    "name": "getBlockNumber",
+    "outputs": [{"internalType": "uint256", "name": "blockNumber", "type": "uint256"}],
+    "stateMutability": "view",
+    "type": "function"
+  }
+]'''
+
+
+def encode_call(fn: ContractFunction) -> bytes:
+    input_types = [collapse_if_tuple(i) for i in fn.abi.get("inputs", [])]
+    return function_abi_to_4byte_selector(fn.abi) + encode(input_types, list(fn.args))
+
+
+def decode_result(fn: ContractFunction, data: bytes) -> Any:
+    output_types = [collapse_if_tuple(o) for o in fn.abi.get("outputs", [])]
+    values = decode(output_types, data)
+    return values[0] if len(values) == 1 else values
+
+
+def multicall(w3: Web3, calls: List[ContractFunction], block_identifier: Any = "latest") -> List[Optional[Any]]:
+    """
+    Executes every bound contract function in `calls` in one eth_call through
+    Multicall3. Returns the decoded results in order; a call that reverts or
+    returns undecodable data yields None instead of failing the whole batch.
+    """
+    if not calls:
+        return []
+    aggregator = w3.eth.contract(address=MULTICALL3_ADDRESS, abi=json.loads(MULTICALL3_ABI))
+    payload = [(fn.address, True, encode_call(fn)) for fn in calls]
+    raw_results = aggregator.functions.aggregate3(payload).call(block_identifier=block_identifier)
+    results: List[Optional[Any]] = []
+    for fn, (success, data) in zip(calls, raw_results):
+        if not success or not data:
+            results.append(None)
+            continue
+        try:
+            results.append(decode_result(fn, data))
+        except Exception:
+            results.append(None)
+    return results
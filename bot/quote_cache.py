@@ -0,0 +1,131 @@
+import math
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from web3 import Web3
+
+# ------------------------------------------------------------------------------
+# Pool events that change a pool's price curve
+# ------------------------------------------------------------------------------
+# Uniswap V2 / SushiSwap pairs emit Sync after every reserve change (swap, mint, burn).
+SYNC_TOPIC = "0x1c411e9a96e071241c2f21f7726b17ae89e3cab4c78be50e062b03a9fffbbad1"
+# Uniswap V3 pools: Swap moves the price, Mint/Burn change in-range liquidity.
+V3_SWAP_TOPIC = "0xc42079f94a6350d7e6235f29174924f928cc2ac818eb64fed8004e115fbcca67"
+V3_MINT_TOPIC = "0x7a53080ba414158be7ec69b987b5fb7d07dee101fe85488f0853ae16239d0bde"
+V3_BURN_TOPIC = "0x0c396cd989a39f4459b5fa1aed6a9a8dcdbc45908acfd67e028cd568da98982c"
+POOL_STATE_TOPICS = [SYNC_TOPIC, V3_SWAP_TOPIC, V3_MINT_TOPIC, V3_BURN_TOPIC]
+
+# Beyond this many blocks since the last refresh, every pool is treated as changed
+# instead of asking the node for a very wide eth_getLogs range.
+MAX_LOG_RANGE = 10_000
+
+
+# ------------------------------------------------------------------------------
+# Pool Version Tracker
+# ------------------------------------------------------------------------------
+class PoolVersionTracker:
+    """
+    Tracks a version per pool: the block of the last event that changed its
+    state. One eth_getLogs call per refresh covers every watched pool, so a
+    quiet pool keeps its version (and its cached quotes) across blocks.
+    """
+
+    def __init__(self, w3: Web3, max_log_range: int = MAX_LOG_RANGE) -> None:
+        self.w3 = w3
+        self.max_log_range = max_log_range
+        self.versions: Dict[str, Optional[int]] = {}
+        self.last_block: Optional[int] = None
+
+    def watch(self, address: str, version: Optional[int] = None) -> None:
+        self.versions.setdefault(address, version)
+
+    def version(self, address: str) -> Optional[int]:
+        return self.versions.get(address)
+
+    def invalidate(self) -> None:
+        """Forgets every version; the next refresh assigns fresh ones."""
+        for address in self.versions:
+            self.versions[address] = None
+
+    def refresh(self, block: Optional[int] = None) -> Set[str]:
+        """Bumps the version of every pool with state-changing logs up to `block`. Returns those pools."""
+        if block is None:
+            block = self.w3.eth.block_number
+        changed: Set[str] = set()
+        if self.versions and self.last_block is not None and block > self.last_block:
+            if block - self.last_block > self.max_log_range:
+                changed = set(self.versions)
+            else:
+                logs = self.w3.eth.get_logs({
+                    "fromBlock": self.last_block + 1,
+                    "toBlock": block,
+                    "address": list(self.versions),
+                    "topics": [POOL_STATE_TOPICS],
+                })
+                changed = {Web3.to_checksum_address(log["address"]) for log in logs}
+        for address, version in self.versions.items():
+            if version is None or address in changed:
+                self.versions[address] = block
+        if self.last_block is None or block > self.last_block:
+            self.last_block = block
+        return changed
+
+
+# ------------------------------------------------------------------------------
+# Quote Cache
+# ------------------------------------------------------------------------------
+QuoteKey = Tuple[str, int, str, str, int]
+
+
+class QuoteCache:
+    """
+    LRU cache of quotes keyed on (pool, pool version, token_in, token_out,
+    amount bucket). With bucket_bps=0 every amount is its own bucket and hits
+    are exact; otherwise amounts within bucket_bps of each other share an
+    entry and the cached output is scaled linearly to the requested amount.
+    """
+
+    def __init__(self, max_entries: int = 4096, bucket_bps: float = 0) -> None:
+        self.max_entries = max_entries
+        self.bucket_bps = bucket_bps
+        self._entries: "OrderedDict[QuoteKey, Tuple[int, int]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def bucket(self, amount_in: int) -> int:
+        if self.bucket_bps <= 0 or amount_in <= 0:
+            return amount_in
+        return int(math.log(amount_in) / math.log1p(self.bucket_bps / 10_000))
+
+    def get(self, pool: str, version: int, token_in: str, token_out: str, amount_in: int) -> Optional[int]:
+        key = (pool, version, token_in, token_out, self.bucket(amount_in))
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        cached_in, cached_out = entry
+        if cached_in == amount_in:
+            return cached_out
+        return cached_out * amount_in // cached_in
+
+    def put(self, pool: str, version: int, token_in: str, token_out: str, amount_in: int, amount_out: int) -> None:
+        key = (pool, version, token_in, token_out, self.bucket(amount_in))
+        self._entries[key] = (amount_in, amount_out)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def seed(self, pool: str, version: int, quotes: Iterable[Tuple[str, str, int, int]]) -> None:
+        """Loads (token_in, token_out, amount_in, amount_out) quotes, e.g. from a persisted snapshot."""
+        for token_in, token_out, amount_in, amount_out in quotes:
+            self.put(pool, version, token_in, token_out, amount_in, amount_out)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
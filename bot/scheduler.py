@@ -0,0 +1,288 @@
+import logging
+import math
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------------------------
+# RPC cost model
+# ------------------------------------------------------------------------------
+# Compute units per method, after Alchemy's published table. Methods not listed
+# cost DEFAULT_METHOD_COST.
+RPC_METHOD_COST: Dict[str, int] = {
+    "eth_chainId": 0,
+    "net_version": 0,
+    "eth_blockNumber": 10,
+    "eth_getTransactionReceipt": 15,
+    "eth_gasPrice": 20,
+    "eth_getBalance": 19,
+    "eth_call": 26,
+    "eth_getTransactionCount": 26,
+    "eth_getBlockByNumber": 16,
+    "eth_getLogs": 75,
+    "eth_estimateGas": 87,
+    "eth_sendRawTransaction": 250,
+}
+DEFAULT_METHOD_COST = 20
+
+
+def method_cost(method: str) -> int:
+    return RPC_METHOD_COST.get(method, DEFAULT_METHOD_COST)
+
+
+# ------------------------------------------------------------------------------
+# RPC Budget: token bucket of compute units
+# ------------------------------------------------------------------------------
+class RpcBudget:
+    """
+    Token bucket of RPC compute units refilled at `rate` per second up to
+    `burst`. Requests are never blocked: each one is debited as it is made and
+    the balance may go negative. Callers check `available` / `wait_time()`
+    before starting work instead. A rate of 0 means unlimited (usage is still
+    counted).
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.rate = rate
+        self.burst = burst if burst is not None else 2 * rate
+        self.clock = clock
+        self._tokens = self.burst
+        self._last_refill = clock()
+        self._lock = threading.Lock()
+        self.used = 0
+        self.calls: Counter = Counter()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.rate <= 0
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def debit(self, method: str) -> None:
+        cost = method_cost(method)
+        with self._lock:
+            self._refill()
+            self._tokens -= cost
+            self.used += cost
+            self.calls[method] += 1
+
+    def try_debit(self, method: str) -> bool:
+        """Debits the call only if its cost is available; this is how a rate-limited server behaves."""
+        if self.unlimited:
+            self.debit(method)
+            return True
+        cost = method_cost(method)
+        with self._lock:
+            self._refill()
+            if self._tokens < cost:
+                return False
+            self._tokens -= cost
+            self.used += cost
+            self.calls[method] += 1
+            return True
+
+    @property
+    def available(self) -> float:
+        if self.unlimited:
+            return math.inf
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def wait_time(self, cost: float = 0.0) -> float:
+        """Seconds until `cost` units are available (0 if they already are)."""
+        if self.unlimited:
+            return 0.0
+        shortfall = cost - self.available
+        return max(0.0, shortfall / self.rate)
+
+
+def rpc_budget_middleware(budget: RpcBudget):
+    """web3 middleware debiting every request made through the provider from `budget`."""
+    def middleware(make_request, w3):
+        def inner(method, params):
+            budget.debit(method)
+            return make_request(method, params)
+        return inner
+    return middleware
+
+
+# ------------------------------------------------------------------------------
+# Adaptive Scheduler
+# ------------------------------------------------------------------------------
+@dataclass
+class ScheduledTarget:
+    """A set of pools evaluated together (e.g. every route of one token pair)."""
+
+    name: str
+    pools: Set[str]
+    interval: int = 1
+    last_block: Optional[int] = None
+    last_profit: Optional[float] = None
+    # EWMA of compute units one evaluation costs.
+    cost: float = 0.0
+    active: bool = False
+    evaluations: int = 0
+    deferred: int = 0
+
+
+@dataclass
+class SchedulerStats:
+    started_at: float
+    used_at_start: int
+    evaluations: int = 0
+    deferred: int = 0
+    blocks: int = 0
+    escalations: int = 0
+    backoffs: int = 0
+    calls: Counter = field(default_factory=Counter)
+
+
+class AdaptiveScheduler:
+    """
+    Decides per block which targets to evaluate within the RPC budget.
+
+    - A target is due when its interval (in blocks) has elapsed or one of its
+      pools changed in the block.
+    - When the spread widens (best profit comes within escalate_margin of
+      min_profit, or jumps by more than escalate_margin), the interval drops
+      to 1: every-block evaluation.
+    - A quiet target (no pool change since its last evaluation) doubles its
+      interval, up to max_interval. Activity without a wider spread halves it.
+    - A due target whose estimated cost exceeds the remaining budget is
+      deferred to a later block. The cost is capped so that a pool-change
+      refresh plus one evaluation always fit a full bucket.
+    """
+
+    def __init__(self, budget: RpcBudget, max_interval: int = 40, escalate_margin: float = 0.05,
+                 min_profit: float = 0.0, initial_cost: float = 200.0, alpha: float = 0.3,
+                 report_interval: float = 60.0, refresh_cost: float = RPC_METHOD_COST["eth_getLogs"]) -> None:
+        self.budget = budget
+        self.max_interval = max(1, max_interval)
+        self.escalate_margin = escalate_margin
+        self.min_profit = min_profit
+        self.initial_cost = initial_cost
+        self.alpha = alpha
+        self.report_interval = report_interval
+        self.refresh_cost = refresh_cost
+        self.targets: Dict[str, ScheduledTarget] = {}
+        self.stats = self._new_stats()
+
+    def _new_stats(self) -> SchedulerStats:
+        return SchedulerStats(started_at=self.budget.clock(), used_at_start=self.budget.used,
+                              calls=Counter(self.budget.calls))
+
+    def add_target(self, name: str, pools: Iterable[str]) -> ScheduledTarget:
+        target = ScheduledTarget(name, set(pools), cost=self.initial_cost)
+        self.targets[name] = target
+        return target
+
+    def admission_cost(self, target: ScheduledTarget) -> float:
+        # The bucket never holds more than burst. Capped at what is left of a full bucket after a
+        # refresh, a costly target still runs (and its cost is re-measured) instead of being
+        # deferred forever.
+        return min(target.cost, max(0.0, self.budget.burst - self.refresh_cost))
+
+    def should_refresh(self, block: int) -> bool:
+        """
+        Whether to look for pool changes at `block`: only if the budget also
+        covers an evaluation afterwards. Skipping is safe, the next refresh
+        covers the skipped blocks.
+        """
+        reserve = max((self.admission_cost(t) for t in self.targets.values()), default=0.0)
+        return self.budget.available >= reserve + self.refresh_cost
+
+    def due(self, block: int, changed: Set[str]) -> List[ScheduledTarget]:
+        """Targets to evaluate at `block`, in registration order, within the available budget."""
+        self.stats.blocks += 1
+        candidates = []
+        for target in self.targets.values():
+            touched = bool(target.pools & changed)
+            target.active = target.active or touched
+            if target.last_block is None or touched or block - target.last_block >= target.interval:
+                candidates.append(target)
+
+        selected: List[ScheduledTarget] = []
+        remaining = self.budget.available
+        for target in candidates:
+            cost = self.admission_cost(target)
+            if remaining >= cost:
+                selected.append(target)
+                remaining -= cost
+            else:
+                target.deferred += 1
+                self.stats.deferred += 1
+        return selected
+
+    def record(self, target: ScheduledTarget, block: int, best_profit: Optional[float], cost: float) -> None:
+        """Updates a target after evaluating it at `block` for `cost` compute units."""
+        if cost > 0:
+            target.cost += self.alpha * (cost - target.cost)
+        widened = best_profit is not None and (
+            best_profit >= self.min_profit - self.escalate_margin
+            or (target.last_profit is not None and best_profit - target.last_profit > self.escalate_margin)
+        )
+        previous = target.interval
+        if widened:
+            target.interval = 1
+        elif not target.active:
+            target.interval = min(target.interval * 2, self.max_interval)
+        else:
+            target.interval = max(1, target.interval // 2)
+        if target.interval == 1 and previous > 1:
+            self.stats.escalations += 1
+            logger.info("⏫ %s: spread %.4f USDC, evaluating every block", target.name,
+                        best_profit if best_profit is not None else float("nan"))
+        elif target.interval > previous:
+            self.stats.backoffs += 1
+            logger.debug("⏬ %s quiet, evaluating every %d blocks", target.name, target.interval)
+
+        if best_profit is not None:
+            target.last_profit = best_profit
+        target.last_block = block
+        target.active = False
+        target.evaluations += 1
+        self.stats.evaluations += 1
+
+    def report(self) -> dict:
+        """Budget usage since the last report. Logs it and starts a new window."""
+        now = self.budget.clock()
+        stats = self.stats
+        elapsed = max(now - stats.started_at, 1e-9)
+        used = self.budget.used - stats.used_at_start
+        calls = Counter(self.budget.calls)
+        calls.subtract(stats.calls)
+        summary = {
+            "seconds": elapsed,
+            "compute_units": used,
+            "compute_units_per_second": used / elapsed,
+            "budget_per_second": self.budget.rate,
+            "utilization": used / (elapsed * self.budget.rate) if not self.budget.unlimited else None,
+            "calls": {method: n for method, n in calls.items() if n},
+            "blocks": stats.blocks,
+            "evaluations": stats.evaluations,
+            "deferred": stats.deferred,
+            "escalations": stats.escalations,
+            "backoffs": stats.backoffs,
+            "intervals": {name: t.interval for name, t in self.targets.items()},
+        }
+        budget = (f"{summary['utilization']:.0%} of {self.budget.rate:.0f} CU/s"
+                  if summary["utilization"] is not None else "unlimited")
+        logger.info("📊 RPC budget: %d CU in %.0fs (%.0f CU/s, %s); %d blocks, %d evaluations, %d deferred; "
+                    "intervals %s", used, elapsed, summary["compute_units_per_second"], budget, stats.blocks,
+                    stats.evaluations, stats.deferred, summary["intervals"])
+        self.stats = self._new_stats()
+        return summary
+
+    def maybe_report(self) -> Optional[dict]:
+        if self.budget.clock() - self.stats.started_at >= self.report_interval:
+            return self.report()
+        return None
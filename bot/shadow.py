@@ -0,0 +1,30 @@
+import json
+import sys
+from typing import List, TextIO
+
+
+# ------------------------------------------------------------------------------
+# Opportunity Stream: one JSON object per evaluated route per block
+# ------------------------------------------------------------------------------
+class OpportunityStream:
+    """
+    Appends opportunity records as JSON lines to a file, or to stdout for "-".
+    Lines are flushed as they are written so the stream can be tailed live.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._fh: TextIO = sys.stdout if path == "-" else open(path, "a", buffering=1, encoding="utf-8")
+        self.records = 0
+        self.profitable = 0
+
+    def emit(self, opportunities: List[dict]) -> None:
+        for opportunity in opportunities:
+            self._fh.write(json.dumps(opportunity, separators=(",", ":"), ensure_ascii=False) + "\n")
+            self.records += 1
+            self.profitable += bool(opportunity.get("profitable"))
+        self._fh.flush()
+
+    def close(self) -> None:
+        if self._fh is not sys.stdout:
+            self._fh.close()
@@ -0,0 +1,132 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# ------------------------------------------------------------------------------
+# Persistent Run-State Store (SQLite, WAL mode)
+# ------------------------------------------------------------------------------
+# Holds everything the bot would otherwise rediscover on every start:
+# - counters:       trade_count, next_reset, last-used nonce, ...
+# - pools:          discovered pool/pair addresses by name
+# - tokens:         token metadata (address, symbol, decimals)
+# - pool_snapshots: latest quoted state per pool, tagged with its block number
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pools (
+    name TEXT PRIMARY KEY,
+    address TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tokens (
+    address TEXT PRIMARY KEY,
+    symbol TEXT NOT NULL,
+    decimals INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pool_snapshots (
+    pool TEXT PRIMARY KEY,
+    block INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class StateStore:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        # WAL keeps writes off the read path; NORMAL sync is durable across
+        # process crashes, which is all a restart needs.
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # --- counters ---------------------------------------------------------------
+    def get_counter(self, name: str, default: Any = None) -> Any:
+        row = self._conn.execute("SELECT value FROM counters WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_counter(self, name: str, value: Any) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO counters (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+                (name, json.dumps(value)),
+            )
+
+    def set_counters(self, values: Dict[str, Any]) -> None:
+        with self._lock:
+            rows = [(name, json.dumps(value)) for name, value in values.items()]
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO counters (name, value) VALUES (?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+                    rows,
+                )
+            except BaseException:
+                # Never leave the connection inside an open transaction: every later BEGIN would fail.
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    # --- pools ------------------------------------------------------------------
+    def get_pool(self, name: str) -> Optional[str]:
+        row = self._conn.execute("SELECT address FROM pools WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_pool(self, name: str, address: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO pools (name, address, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET address = excluded.address, updated_at = excluded.updated_at",
+                (name, address, time.time()),
+            )
+
+    def get_pools(self) -> Dict[str, str]:
+        return dict(self._conn.execute("SELECT name, address FROM pools").fetchall())
+
+    # --- tokens -----------------------------------------------------------------
+    def get_token(self, address: str) -> Optional[dict]:
+        row = self._conn.execute(
+            "SELECT symbol, decimals FROM tokens WHERE address = ?", (address,)
+        ).fetchone()
+        return {"address": address, "symbol": row[0], "decimals": row[1]} if row else None
+
+    def set_token(self, address: str, symbol: str, decimals: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO tokens (address, symbol, decimals, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(address) DO UPDATE SET symbol = excluded.symbol, "
+                "decimals = excluded.decimals, updated_at = excluded.updated_at",
+                (address, symbol, decimals, time.time()),
+            )
+
+    # --- pool snapshots ---------------------------------------------------------
+    def save_snapshot(self, pool: str, block: int, state: dict) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO pool_snapshots (pool, block, state, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(pool) DO UPDATE SET block = excluded.block, state = excluded.state, "
+                "updated_at = excluded.updated_at",
+                (pool, block, json.dumps(state), time.time()),
+            )
+
+    def load_snapshots(self) -> Dict[str, dict]:
+        """Returns {pool: {"block": n, "updated_at": ts, "state": {...}}}."""
+        rows = self._conn.execute("SELECT pool, block, state, updated_at FROM pool_snapshots").fetchall()
+        return {
+            pool: {"block": block, "updated_at": updated_at, "state": json.loads(state)}
+            for pool, block, state, updated_at in rows
+        }
@@ -0,0 +1,217 @@
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import List, Optional
+
+import requests
+from web3 import Web3
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------------------------
+# Submission Backends
+# ------------------------------------------------------------------------------
+# "public"  - eth_sendRawTransaction on the bot's own node (original behaviour)
+# "private" - eth_sendRawTransaction fanned out to private relay RPCs in parallel
+# "bundle"  - eth_sendBundle for a window of target blocks, with revert protection
+SUBMISSION_MODES = ("public", "private", "bundle")
+
+
+class RelayError(Exception):
+    """Raised when a relay rejects a request or returns a JSON-RPC error."""
+
+
+class SubmissionBackend:
+    name: str = "base"
+
+    def __init__(self) -> None:
+        # Cancel event of the latest submission. Each submission gets its own, so
+        # retries a previous one left running in the background stay cancelled.
+        self._cancelled = threading.Event()
+
+    def submit(self, raw_tx: bytes, tx_hash: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def cancel(self) -> None:
+        """Stops any retries or block-window resubmission still in flight."""
+        self._cancelled.set()
+
+    def start_submission(self) -> threading.Event:
+        """Cancels whatever the previous submission still has in flight and returns the new one's event."""
+        self._cancelled.set()
+        self._cancelled = threading.Event()
+        return self._cancelled
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+
+class PublicMempoolBackend(SubmissionBackend):
+    name = "public"
+
+    def __init__(self, w3: Web3) -> None:
+        super().__init__()
+        self.w3 = w3
+
+    def submit(self, raw_tx: bytes, tx_hash: str) -> Optional[str]:
+        return self.w3.eth.send_raw_transaction(raw_tx).hex()
+
+
+class RelayClient:
+    """Minimal JSON-RPC client for one relay endpoint with retry and backoff."""
+
+    def __init__(self, url: str, timeout: float = 2.0, max_retries: int = 2,
+                 retry_backoff: float = 0.1, session: Optional[requests.Session] = None) -> None:
+        self.url = url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.session = session or requests.Session()
+
+    def call(self, method: str, params: list, cancelled: Optional[threading.Event] = None):
+        payload = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
+        last_error: Optional[Exception] = None
+        for attempt in range(self.max_retries + 1):
+            if cancelled is not None and cancelled.is_set():
+                raise RelayError(f"{method} to {self.url} cancelled")
+            try:
+                response = self.session.post(self.url, json=payload, timeout=self.timeout)
+                response.raise_for_status()
+                body = response.json()
+                if "error" in body:
+                    raise RelayError(f"{self.url}: {body['error']}")
+                return body.get("result")
+            except (requests.RequestException, ValueError, RelayError) as e:
+                last_error = e
+                if attempt < self.max_retries:
+                    logger.warning(f"Relay {self.url} {method} attempt {attempt + 1} failed: {e}; retrying")
+                    # Event.wait doubles as an interruptible sleep for cancel().
+                    if cancelled is not None:
+                        cancelled.wait(self.retry_backoff * (2 ** attempt))
+                    else:
+                        time.sleep(self.retry_backoff * (2 ** attempt))
+        raise RelayError(f"{method} to {self.url} failed after {self.max_retries + 1} attempts: {last_error}")
+
+
+class PrivateRelayBackend(SubmissionBackend):
+    name = "private"
+    method = "eth_sendRawTransaction"
+
+    def __init__(self, relay_urls: List[str], timeout: float = 2.0, max_retries: int = 2,
+                 retry_backoff: float = 0.1) -> None:
+        super().__init__()
+        if not relay_urls:
+            raise ValueError("At least one relay URL is required for private submission.")
+        self.relays = [RelayClient(url, timeout, max_retries, retry_backoff) for url in relay_urls]
+        self._pool = ThreadPoolExecutor(max_workers=len(self.relays), thread_name_prefix="relay")
+
+    def _send_one(self, relay: RelayClient, method: str, params: list, cancelled: threading.Event) -> tuple:
+        start = time.perf_counter()
+        result = relay.call(method, params, cancelled)
+        return relay.url, result, (time.perf_counter() - start) * 1000
+
+    def broadcast(self, method: str, params: list) -> Optional[tuple]:
+        """
+        Sends the same request to every relay in parallel and returns
+        (url, result, latency_ms) from the first relay that accepts it.
+        The remaining relays keep delivering in the background until the
+        submission is cancelled or the next one starts.
+        """
+        cancelled = self._cancelled
+        futures = {self._pool.submit(self._send_one, relay, method, params, cancelled) for relay in self.relays}
+        pending = futures
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    url, result, latency_ms = future.result()
+                except RelayError as e:
+                    logger.error(f"Relay submission failed: {e}")
+                    continue
+                logger.info(f"📡 {method} accepted by {url} in {latency_ms:.1f} ms")
+                return url, result, latency_ms
+        return None
+
+    def submit(self, raw_tx: bytes, tx_hash: str) -> Optional[str]:
+        self.start_submission()
+        accepted = self.broadcast(self.method, [Web3.to_hex(raw_tx)])
+        if accepted is None:
+            logger.error(f"❌ No private relay accepted transaction {tx_hash}")
+            return None
+        return tx_hash
+
+
+class BundleBackend(PrivateRelayBackend):
+    name = "bundle"
+
+    def __init__(self, w3: Web3, relay_urls: List[str], target_blocks: int = 3, timeout: float = 2.0,
+                 max_retries: int = 2, retry_backoff: float = 0.1, poll_interval: float = 0.25) -> None:
+        super().__init__(relay_urls, timeout, max_retries, retry_backoff)
+        self.w3 = w3
+        self.target_blocks = max(1, target_blocks)
+        self.poll_interval = poll_interval
+        self._replacement_uuid: Optional[str] = None
+
+    def submit(self, raw_tx: bytes, tx_hash: str) -> Optional[str]:
+        # An empty revertingTxHashes list is the revert protection: relays drop
+        # the bundle rather than land a transaction that reverts.
+        cancelled = self.start_submission()
+        current_block = self.w3.eth.block_number
+        self._replacement_uuid = str(uuid.uuid4())
+        last_target = current_block + self.target_blocks
+        for target in range(current_block + 1, last_target + 1):
+            if cancelled.is_set():
+                logger.warning(f"Bundle for {tx_hash} cancelled before block {target}")
+                return None
+            bundle = {
+                "txs": [Web3.to_hex(raw_tx)],
+                "blockNumber": hex(target),
+                "revertingTxHashes": [],
+                "replacementUuid": self._replacement_uuid,
+            }
+            if self.broadcast("eth_sendBundle", [bundle]) is None:
+                logger.error(f"❌ No relay accepted bundle for block {target}")
+        result = self.wait_for_inclusion(tx_hash, last_target)
+        # Landed or past its last target block: nothing left for cancel() to withdraw.
+        self._replacement_uuid = None
+        return result
+
+    def wait_for_inclusion(self, tx_hash: str, last_target: int) -> Optional[str]:
+        cancelled = self._cancelled
+        while not cancelled.is_set():
+            try:
+                receipt = self.w3.eth.get_transaction_receipt(tx_hash)
+                logger.info(f"✅ Bundle landed in block {receipt['blockNumber']} (status {receipt['status']})")
+                return tx_hash
+            except Exception:
+                pass
+            if self.w3.eth.block_number > last_target:
+                logger.warning(f"⚠️ Bundle for {tx_hash} not included by block {last_target}")
+                return None
+            cancelled.wait(self.poll_interval)
+        return None
+
+    def cancel(self) -> None:
+        super().cancel()
+        if self._replacement_uuid is None:
+            return
+        # The submission's event is already set, so call the relays directly without it.
+        for relay in self.relays:
+            try:
+                relay.call("eth_cancelBundle", [{"replacementUuid": self._replacement_uuid}])
+            except RelayError as e:
+                logger.error(f"Failed to cancel bundle on {relay.url}: {e}")
+
+
+def build_submission_backend(mode: str, w3: Web3, relay_urls: List[str], target_blocks: int = 3,
+                             timeout: float = 2.0, max_retries: int = 2) -> SubmissionBackend:
+    if mode == "public":
+        return PublicMempoolBackend(w3)
+    if mode == "private":
+        return PrivateRelayBackend(relay_urls, timeout, max_retries)
+    if mode == "bundle":
+        return BundleBackend(w3, relay_urls, target_blocks, timeout, max_retries)
+    raise ValueError(f"Unknown SUBMISSION_MODE '{mode}', expected one of {SUBMISSION_MODES}")
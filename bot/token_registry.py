@@ -0,0 +1,102 @@
+import json
+import logging
+from typing import Dict, Optional
+
+from web3 import Web3
+
+from .multicall import multicall
+from .state_store import StateStore
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------------------------
+# ERC-20 metadata ABIs
+# ------------------------------------------------------------------------------
+ERC20_METADATA_ABI = '''[
+    {"constant": true, "inputs": [], "name": "decimals",
+     "outputs": [{"name": "", "type": "uint8"}],
+     "stateMutability": "view", "type": "function"},
+    {"constant": true, "inputs": [], "name": "symbol",
+     "outputs": [{"name": "", "type": "string"}],
+     "stateMutability": "view", "type": "function"}
+]'''
+
+# A few older tokens (e.g. MKR) return symbol as bytes32 instead of string.
+ERC20_BYTES32_SYMBOL_ABI = '''[
+    {"constant": true, "inputs": [], "name": "symbol",
+     "outputs": [{"name": "", "type": "bytes32"}],
+     "stateMutability": "view", "type": "function"}
+]'''
+
+
+# ------------------------------------------------------------------------------
+# Token Registry
+# ------------------------------------------------------------------------------
+class TokenRegistry:
+    """
+    Token metadata (address, on-chain symbol, decimals) for every configured
+    token. Anything not already in the state store is discovered in a single
+    Multicall3 batch, so quoting never pays for a metadata lookup.
+    """
+
+    def __init__(self, w3: Web3, store: StateStore) -> None:
+        self.w3 = w3
+        self.store = store
+        self._tokens: Dict[str, dict] = {}
+
+    def load(self, tokens: Dict[str, str]) -> None:
+        """Registers {name: address}, discovering uncached metadata in one batched call."""
+        missing: Dict[str, str] = {}
+        for name, address in tokens.items():
+            cached = self.store.get_token(address)
+            if cached is not None:
+                self._tokens[name] = cached
+            else:
+                missing[name] = address
+        if missing:
+            self._discover(missing)
+
+    def _discover(self, tokens: Dict[str, str]) -> None:
+        abi = json.loads(ERC20_METADATA_ABI)
+        calls = []
+        for address in tokens.values():
+            contract = self.w3.eth.contract(address=address, abi=abi)
+            calls += [contract.functions.decimals(), contract.functions.symbol()]
+        results = multicall(self.w3, calls)
+        for i, (name, address) in enumerate(tokens.items()):
+            decimals, symbol = results[2 * i], results[2 * i + 1]
+            if decimals is None:
+                raise ValueError(f"Could not read decimals() for {name} at {address}")
+            if symbol is None:
+                symbol = self._bytes32_symbol(address) or name
+            self.store.set_token(address, symbol, decimals)
+            self._tokens[name] = {"address": address, "symbol": symbol, "decimals": decimals}
+            logger.info(f"🪙 Discovered {name} ({symbol}) at {address}: {decimals} decimals")
+
+    def _bytes32_symbol(self, address: str) -> Optional[str]:
+        try:
+            contract = self.w3.eth.contract(address=address, abi=json.loads(ERC20_BYTES32_SYMBOL_ABI))
+            return contract.functions.symbol().call().rstrip(b"\x00").decode()
+        except Exception:
+            return None
+
+    def decimals(self, name: str) -> int:
+        try:
+            return self._tokens[name]["decimals"]
+        except KeyError:
+            raise KeyError(f"Token {name} is not registered; add it to TOKENS") from None
+
+    def address(self, name: str) -> str:
+        return self._tokens[name]["address"]
+
+    def symbol(self, name: str) -> str:
+        return self._tokens[name]["symbol"]
+
+    def to_human(self, name: str, raw_amount: int) -> float:
+        return raw_amount / (10 ** self.decimals(name))
+
+    def to_raw(self, name: str, amount: float) -> int:
+        return int(amount * (10 ** self.decimals(name)))
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._tokens